@@ -3,9 +3,8 @@ from .plant import Plant, Root, CELL_SIZE, ROWS, COLS, directions, SHOOT_COLOUR,
 import pygame
 import random
 import math
-from config import TIME_SCALE
 from soil import soil_properties
-from weather import sun
+from occupancy import OccupancyGrid, root_occupancy
 
 
 
@@ -13,15 +12,18 @@ class CactusRoot(Root):
         def __init__(self, x, y):
             super().__init__(x, y, target_horizon='B')
             self.max_spread = 2000   # Allow a wider horizontal spread.
-            self.tips = [self.Tip(x, y)]
+            self.tips = []
+            self._wakeups.clear()
+            self.add_tip(self.Tip(x, y, tip_id=self.next_tip_id()))
+            self.recount()
 
         class Tip(Root.RootTip):
             def grow(self, root_system):
                 allowed_depth = root_system.y + root_system.max_depth * CELL_SIZE
 
                 # Check the last segment’s y-position.
-                last_segment = self.segments[-1]
-                if last_segment['y'] >= allowed_depth:
+                _, last_y, _ = self.segments.last()
+                if last_y >= allowed_depth:
                     print("Cactus root tip reached maximum allowed depth; skipping further vertical growth.")
                     return
 
@@ -33,20 +35,20 @@ class CactusRoot(Root):
 
                 # Validate the newly added segment (if any).
                 if len(self.segments) > old_segment_count:
-                    new_segment = self.segments[-1]
+                    new_x, new_y, _ = self.segments.last()
                     allowed_spread = root_system.max_spread * CELL_SIZE
-                    print(f"Cactus new segment at y: {new_segment['y']}, allowed depth: {allowed_depth}")
-                    print(f"Cactus new segment x diff: {abs(new_segment['x'] - root_system.x)}, allowed spread: {allowed_spread}")
-                    if (new_segment['y'] > allowed_depth or 
-                        abs(new_segment['x'] - root_system.x) > allowed_spread):
+                    print(f"Cactus new segment at y: {new_y}, allowed depth: {allowed_depth}")
+                    print(f"Cactus new segment x diff: {abs(new_x - root_system.x)}, allowed spread: {allowed_spread}")
+                    if (new_y > allowed_depth or 
+                        abs(new_x - root_system.x) > allowed_spread):
                         print("Removing cactus root segment: out of allowed bounds.")
                         self.segments.pop()
-                        self.occupied_positions.discard((new_segment['x'], new_segment['y']))
+                        root_occupancy.release(*OccupancyGrid.cell_of(new_x, new_y), root_system.plant_id)
+                        root_system.recount()
                         self.growth_accumulator += 1.0
 
                 # Age all segments.
-                for seg in self.segments:
-                    seg['age'] += 1
+                self.ticks += 1
 
 
 
@@ -85,14 +87,17 @@ class Cactus(Plant):
 
         super().update_health(sunlight_factor, nutrient_factor, moisture_factor, growth_increment)
 
-    def grow(self):
+    def grow(self, grow_roots=True):
+        dt = 1
+        self.age += dt
         if self.alive:
-            self.roots.grow()
+            if grow_roots:
+                self.roots.grow()
 
 
             if self.age >= self.shoot_delay:
                 # Let the base class update growth (shoot_height, cotyledon_growth, leaves, stem_segments, etc.)
-                super().grow()
+                super().grow(grow_roots=False)
 
                 # Calculate a base thickness from the original logic.
             
@@ -105,13 +110,7 @@ class Cactus(Plant):
                     self.stem_width = (1 + (self.stem_above_soil // 20)) if self.stem_above_soil > 0 else 1
 
 
-    def draw(self, screen, simulation_running):
-        if simulation_running:
-            dt = 1
-            self.age += dt
-            self.grow()
-        
-    
+    def draw(self, screen):
         # Draw the roots after drawing the above-ground parts.
         self.roots.draw(screen)
         # Only draw above-ground if the plant has passed its shoot delay.
@@ -137,9 +136,10 @@ class Cactus(Plant):
                 pygame.draw.ellipse(screen, SHOOT_COLOUR, stem_rect)
             else:
                 # Before the stem breaches the soil, use the original segmented drawing:
-                for i in range(len(self.stem_segments) - 1):
-                    start_pos = (self.stem_segments[i]['x'], self.stem_segments[i]['y'])
-                    end_pos   = (self.stem_segments[i+1]['x'], self.stem_segments[i+1]['y'])
+                stem_points = self.stem_segments.rows()
+                for i in range(len(stem_points) - 1):
+                    start_pos = stem_points[i][:2]
+                    end_pos   = stem_points[i+1][:2]
                     # Compute rectangle that spans from start_pos to end_pos.
                     x = min(start_pos[0], end_pos[0])
                     y = min(start_pos[1], end_pos[1])
@@ -0,0 +1,163 @@
+# plants/germination.py
+import heapq
+import itertools
+import numpy as np
+import config
+import weather
+from config import CELL_SIZE
+from soil import soil_properties
+from soil_field import TILE_SIZE
+
+# Moisture a dormant seed's cell may drift from the value its wake tick was
+# predicted with before the seed is re-predicted (cf. soil_lod.ERROR_BUDGET).
+MOISTURE_TOLERANCE = 0.05
+
+
+def days_per_tick():
+    """Simulated days that pass in one tick at the current time scale and day length."""
+    return config.TIME_SCALE / weather.sun.day_length
+
+
+def time_scale_factor():
+    """
+    Length of a tick relative to one at the default time scale. Per-tick rates
+    tuned at the default (imbibition, health) scale by this, so a scenario's
+    time_scale changes tick length but each season behaves as it always has.
+    """
+    return config.TIME_SCALE / config.DEFAULT_TIME_SCALE
+
+
+def environment_key():
+    """Everything outside the seed's own cell that sets how fast it imbibes."""
+    season = weather.current_season
+    return (season, weather.SEASONS[season]['temperature'], config.TIME_SCALE, weather.sun.day_length)
+
+
+class GerminationScheduler:
+    """
+    Event-driven imbibition for dormant seeds.
+    Under constant conditions a seed absorbs the same amount of water every tick,
+    so the tick it germinates on follows in closed form (Seed.ticks_to_germinate).
+    Dormant seeds wait in a heap keyed by that tick and are not touched in
+    between. A seed is re-predicted only when the moisture of its own cell
+    drifts by more than MOISTURE_TOLERANCE (checked for the seeds on tiles
+    whose version changed) or the environment key (season, its temperature,
+    TIME_SCALE, day length) changes.
+
+    Each heap entry carries the seed's generation at the time it was pushed;
+    a new prediction bumps the generation, so at most one entry per seed is
+    live and compaction keeps exactly those.
+    """
+    def __init__(self):
+        self.tick = 0
+        self.seeds = set()
+        self.repredictions = 0
+        self._heap = []
+        self._order = itertools.count()
+        self._by_tile = {}  # (tile_row, tile_col) -> dormant seeds on that tile
+        self._field = None
+        self._seen_versions = None
+        self._env = None
+
+    @staticmethod
+    def tile_of(seed):
+        return (int(seed.y // CELL_SIZE) // TILE_SIZE, int(seed.x // CELL_SIZE) // TILE_SIZE)
+
+    def add(self, seed):
+        """Start tracking a seed that has landed."""
+        seed.synced_tick = self.tick
+        seed.wake_tick = None
+        self.seeds.add(seed)
+        self._by_tile.setdefault(self.tile_of(seed), set()).add(seed)
+        self._predict(seed)
+
+    def remove(self, seed):
+        self.seeds.discard(seed)
+        self._by_tile.get(self.tile_of(seed), set()).discard(seed)
+        seed.wake_tick = None
+
+    def clear(self):
+        self.seeds.clear()
+        self._by_tile.clear()
+        self._heap.clear()
+
+    def catch_up(self, seed):
+        """Apply the ticks a dormant seed has slept through, at the rates it was predicted with."""
+        elapsed = self.tick - seed.synced_tick
+        if elapsed > 0:
+            seed.advance_imbibition(elapsed, *seed.imbibition_rates)
+            seed.synced_tick = self.tick
+
+    def _predict(self, seed):
+        seed.imbibition_rates = (seed.imbibition_rate(), days_per_tick())
+        ticks = seed.ticks_to_germinate(seed.imbibition_rates[0])
+        self.repredictions += 1
+        wake_tick = None if ticks is None else self.tick + ticks
+        if wake_tick == seed.wake_tick:
+            return  # its live entry (if any) is still right
+        # No water uptake (wake_tick None): nothing happens until the cell or
+        # the season changes, and any entry it had is now stale.
+        seed.wake_tick = wake_tick
+        seed.wake_generation += 1
+        if wake_tick is None:
+            return
+        heapq.heappush(self._heap, (wake_tick, next(self._order), seed.wake_generation, seed))
+        if len(self._heap) > 2 * len(self.seeds) + 64:
+            self._compact()
+
+    def _live(self, entry):
+        seed = entry[3]
+        return seed in self.seeds and seed.wake_generation == entry[2]
+
+    def _compact(self):
+        """Drop heap entries left behind by re-predictions, keeping one live entry per seed."""
+        self._heap = [entry for entry in self._heap if self._live(entry)]
+        heapq.heapify(self._heap)
+
+    def _repredict(self, seed):
+        self.catch_up(seed)
+        self._predict(seed)
+
+    def _refresh(self):
+        """Re-predict the seeds whose conditions changed since the last tick."""
+        field = soil_properties['grid']
+        env = environment_key()
+        if field is not self._field or env != self._env:
+            self._field = field
+            self._env = env
+            self._seen_versions = field.tile_versions.copy()
+            for seed in list(self.seeds):
+                self._repredict(seed)
+            return
+        changed = np.argwhere(field.tile_versions != self._seen_versions)
+        if len(changed):
+            self._seen_versions[:] = field.tile_versions
+            candidates = [seed for tile in map(tuple, changed.tolist())
+                          for seed in self._by_tile.get(tile, ())]
+            if not candidates:
+                return
+            # A tile version covers a whole tile; only each seed's own cell matters.
+            rows, cols = np.array([seed.cell for seed in candidates]).T
+            drift = np.abs(field.moisture[rows, cols] - [seed.cell_moisture for seed in candidates])
+            for index in np.flatnonzero(drift > MOISTURE_TOLERANCE).tolist():
+                self._repredict(candidates[index])
+
+    def step(self):
+        """Advance one tick and germinate the seeds that are due."""
+        self._refresh()
+        self.tick += 1
+        while self._heap and self._heap[0][0] <= self.tick:
+            entry = heapq.heappop(self._heap)
+            if not self._live(entry):
+                continue
+            seed = entry[3]
+            seed.wake_tick = None
+            self.catch_up(seed)
+            if seed.germinated:
+                self.remove(seed)
+            else:
+                # Rounding left it just short of saturation.
+                self._predict(seed)
+
+
+germination_scheduler = GerminationScheduler()
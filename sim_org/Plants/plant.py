@@ -2,11 +2,20 @@
 import pygame
 import random
 import math
-from config import CELL_SIZE,SOIL_ROWS, ROWS, COLS, TIME_SCALE, GEOTROPISM_WEIGHTS, w_PH, w_air, W_geo, W_hydro, W_chemo, W_thermo, SCREEN_SIZE
+import itertools
+import heapq
+import numpy as np
+from config import CELL_SIZE,SOIL_ROWS, ROWS, COLS, GEOTROPISM_WEIGHTS, w_PH, w_air, W_geo, W_hydro, W_chemo, W_thermo, SCREEN_SIZE
 
 
-from soil import soil_properties, SOIL_TYPES, SOILPH
-from weather import sun, SEASONS, current_season  
+import soil
+from soil import soil_properties, SOIL_TYPES, diurnal_cycle
+from soil_field import NUTRIENT_LAYERS
+from Plants.segments import SegmentArray, Polyline
+from occupancy import OccupancyGrid, root_occupancy
+from Plants.germination import germination_scheduler, days_per_tick, time_scale_factor
+import weather
+from weather import SEASONS
 
 SEED_COLOUR = (34, 139, 34)
 SHOOT_COLOUR = (50, 205, 50)
@@ -54,62 +63,93 @@ class Seed:
         self.on_ground = False
         self.ground_level = SOIL_ROWS * CELL_SIZE
 
-        self.temp = SEASONS[current_season]['temperature']
+        self.temp = SEASONS[weather.current_season]['temperature']
         self.moisture_factor = 0.0
 
+        # Bumped whenever state reported by get_stats changes.
+        self.version = 0
+        self._stats_cache = (None, None)
+
+        # Germination scheduler bookkeeping: the predicted wake tick and the
+        # generation that marks which of the seed's heap entries is live.
+        self.wake_tick = None
+        self.wake_generation = 0
+
     def apply_gravity(self):
         if not self.on_ground:
+            self.version += 1
             self.y += self.gravity_speed
             if self.y >= self.ground_level:
                 self.y = self.ground_level
                 self.on_ground = True
                
                 self.plant = Plant(self.x, self.y)
+                germination_scheduler.add(self)
 
-    def update_imbibition(self):
-        if not self.on_ground:
-            return 
-
-        dt = 10
-        self.age += TIME_SCALE / sun.day_length
-
-        if not self.germinated:
-            self.time_to_germinate += TIME_SCALE / sun.day_length
-
-        self.plant.time_to_germinate = self.time_to_germinate
-
+    def imbibition_rate(self):
+        """
+        Water absorbed per tick under the current conditions of the seed's cell
+        and season. Also refreshes moisture_factor and temp for get_seed_status.
+        """
+        dt = 10 * time_scale_factor()
         grid_x = int(self.x // CELL_SIZE)
         grid_y = int(self.y // CELL_SIZE)
-        if 0 <= grid_x < COLS and 0 <= grid_y < ROWS:
-            local_moisture = soil_properties['grid'][grid_y][grid_x]['moisture']
-        else:
-            local_moisture = 0
+        local_moisture = soil_properties['grid'].value('moisture', grid_y, grid_x)
+        # The germination scheduler re-predicts only when this cell's moisture changes.
+        self.cell = (grid_y, grid_x)
+        self.cell_moisture = local_moisture
 
         optimal_soil_moisture = 10.0  
         self.moisture_factor = max(0, min(local_moisture / optimal_soil_moisture, 1))
-        self.temp = SEASONS[current_season]['temperature']
+        self.temp = SEASONS[weather.current_season]['temperature']
 
         optimal_temp = 20.0
         sigma_temp = 5.0
         temp_factor = math.exp(-((self.temp - optimal_temp) ** 2) / (2 * sigma_temp ** 2))
+        return self.initial_uptake_rate * dt * self.moisture_factor * temp_factor
+
+    def ticks_to_germinate(self, rate):
+        """Ticks at a constant per-tick water rate until hydration reaches saturation_ratio, or None."""
+        needed = self.saturation_ratio * self.dry_weight - self.water_absorbed
+        if needed <= 0:
+            return 0
+        if rate <= 0:
+            return None
+        return math.ceil(needed / rate)
+
+    def advance_imbibition(self, ticks, rate, days):
+        """Apply several ticks of imbibition at once: rate is water and days is age per tick."""
+        self.age += ticks * days
 
-        self.water_absorbed += self.initial_uptake_rate * dt * self.moisture_factor * temp_factor
+        if not self.germinated:
+            self.version += 1
+            self.time_to_germinate += ticks * days
+            self.plant.time_to_germinate = self.time_to_germinate
+            self.plant.version += 1
+
+        self.water_absorbed += rate * ticks
         self.hydration = self.water_absorbed / self.dry_weight
         self.current_weight = self.starting_weight + self.water_absorbed
 
         if self.hydration >= self.saturation_ratio and not self.germinated:
             self.germinated = True
 
-    def draw(self, screen, simulation_running):
-        self.apply_gravity()
-        print(f"Drawing seed at ({self.x}, {self.y})")
+    def update_imbibition(self):
+        if not self.on_ground:
+            return 
+        self.advance_imbibition(1, self.imbibition_rate(), days_per_tick())
+
+    def sync(self):
+        """Bring a dormant seed's state up to date before it is reported."""
+        if self in germination_scheduler.seeds:
+            germination_scheduler.catch_up(self)
+
+    def draw(self, screen):
+        """Draw the seed and its plant; the seed is advanced by Simulation.step."""
         pygame.draw.circle(screen, SEED_COLOUR, (int(self.x), int(self.y)), self.size)
 
-        if simulation_running and self.on_ground:
-            self.update_imbibition()
-            if self.germinated and self.plant:
-                self.plant.grow()
-                self.plant.draw(screen)
+        if self.germinated and self.plant:
+            self.plant.draw(screen)
 
     def get_seed_status(self):
         if self.temp < 5 or self.temp > 35:
@@ -124,8 +164,19 @@ class Seed:
         else:
             return "healthy"
 
+    def state_version(self):
+        """Hashable key that changes whenever this seed's or its plant's reported stats change."""
+        self.sync()
+        if self.plant is None:
+            return (id(self), self.version, self.age)
+        return (id(self), self.version, self.age) + self.plant.stats_key()
+
     def get_stats(self):
         if not self.germinated:
+            self.sync()
+            cached_version, cached_stats = self._stats_cache
+            if cached_version == self.version:
+                return cached_stats
             status = self.get_seed_status()
             result = {
                 "plant_type": "Sunflower",
@@ -140,6 +191,7 @@ class Seed:
             }
             if not self.alive:
                 result["death_reason"] = status
+            self._stats_cache = (self.version, result)
             return result
         else:
             return self.plant.get_stats()
@@ -149,6 +201,18 @@ class Seed:
 
 MAX_ROOT_TIPS = 10
 
+# Per-cell level at which a nutrient no longer limits root uptake.
+ROOT_ZONE_NUTRIENT_SATURATION = 40.0
+
+# Longest a root tip boxed in by occupied cells sleeps before it looks again.
+MAX_BLOCKED_BACKOFF = 64
+
+_root_system_ids = itertools.count(1)
+
+# Purely decorative randomness (flower seed dots), kept off the global RNG so
+# drawing a frame never changes what the simulation does next.
+_DECOR_RNG = random.Random()
+
 # Standard directional lambdas.
 directions = {
     'left':       lambda x, y: {'x': x - CELL_SIZE, 'y': y},
@@ -162,6 +226,90 @@ directions = {
     'right-branch': lambda x, y: {'x': x + 2*CELL_SIZE, 'y': y + int(CELL_SIZE/2)}
 }
 
+STANDARD_DIRECTIONS = ['left', 'right', 'down', 'up', 'down-left', 'down-right']
+
+# Pixel offsets and geotropism weights of the standard directions, in STANDARD_DIRECTIONS order.
+_DIRECTION_DX = np.array([directions[d](0, 0)['x'] for d in STANDARD_DIRECTIONS])
+_DIRECTION_DY = np.array([directions[d](0, 0)['y'] for d in STANDARD_DIRECTIONS])
+_GEOTROPISM = np.array([GEOTROPISM_WEIGHTS[d] for d in STANDARD_DIRECTIONS])
+
+ROOT_OPTIMAL_TEMP = 20.0
+ROOT_TEMP_SIGMA = 10.0
+
+
+def score_root_tips(entries):
+    """
+    Score the six standard directions of many root tips in one vectorized pass.
+    entries is a list of (tip, root_system) pairs. Returns one {direction: score}
+    dict per tip, holding only candidates that are on the grid and not taken
+    by any plant's roots in root_occupancy.
+    """
+    if not entries:
+        return []
+    field = soil_properties['grid']
+    index = soil_properties['horizon_index']
+
+    last = np.array([tip.segments.last()[:2] for tip, _ in entries])
+    cand_x = last[:, 0:1] + _DIRECTION_DX
+    cand_y = last[:, 1:2] + _DIRECTION_DY
+    nutrient_factor = np.empty(len(entries))
+    root_nutrients = {}
+    for i, (tip, root_system) in enumerate(entries):
+        # absorb_nutrients is per root system, not per candidate.
+        if id(root_system) not in root_nutrients:
+            root_nutrients[id(root_system)] = root_system.absorb_nutrients()
+        nutrient_factor[i] = root_nutrients[id(root_system)]
+
+    grid_x = (cand_x // CELL_SIZE).astype(np.intp)
+    grid_y = (cand_y // CELL_SIZE).astype(np.intp)
+    valid = (grid_x >= 0) & (grid_x < COLS) & (grid_y >= 0) & (grid_y < ROWS)
+    valid[valid] = root_occupancy.free_mask(grid_y[valid], grid_x[valid])
+    rows, cols = grid_y[valid], grid_x[valid]
+
+    moisture = field.moisture[rows, cols]
+    local_temp = field.temperature_at_cells(rows, cols, diurnal_cycle())
+    resistance = index.resistance[rows]
+    temp_factor = np.exp(-((local_temp - ROOT_OPTIMAL_TEMP) ** 2) / (2 * ROOT_TEMP_SIGMA ** 2))
+    nutrients = np.broadcast_to(nutrient_factor[:, None], valid.shape)[valid]
+    geotropism = np.broadcast_to(_GEOTROPISM, valid.shape)[valid]
+
+    scores = np.zeros(valid.shape)
+    scores[valid] = (
+        (W_hydro * (moisture / resistance)) *
+        (W_thermo * temp_factor) *
+        (W_chemo * nutrients) *
+        (W_geo   * geotropism)
+    )
+
+    valid_list = valid.tolist()
+    score_list = scores.tolist()
+    return [
+        {dkey: score_list[i][j] for j, dkey in enumerate(STANDARD_DIRECTIONS) if valid_list[i][j]}
+        for i in range(len(entries))
+    ]
+
+
+def grow_root_systems(root_systems):
+    """
+    Advance several root systems (e.g. all plants) by one tick.
+    Only tips that are due (see Root.due_tips) are scored, all together by
+    score_root_tips; the choose/grow/branch step then runs per tip. Tips whose
+    class overrides grow() keep their own path.
+    """
+    entries = [(tip, root_system)
+               for root_system in root_systems
+               for tip in root_system.due_tips()]
+    batched = [entry for entry in entries if type(entry[0]).grow is Root.RootTip.grow]
+    scores = dict(zip(map(id, (tip for tip, _ in batched)), score_root_tips(batched)))
+    for tip, root_system in entries:
+        tip_scores = scores.get(id(tip))
+        if tip_scores is not None:
+            tip.grow(root_system, tip_scores)
+        else:
+            tip.grow(root_system)
+        root_system.schedule(tip)
+
+
 class Root:
     """
     A root system that starts with one main (tap) root tip and can branch into multiple tips.
@@ -169,48 +317,110 @@ class Root:
     def __init__(self, x, y):
         self.x = x
         self.y = y
-        self.tips = [self.RootTip(x, y, direction='down')]
+        # The root system's id doubles as the plant id in root_occupancy.
+        self.plant_id = next(_root_system_ids)
+        self._tip_ids = itertools.count()
+        # Growth clock and a heap of (wake tick, tip id, tip) for tips still growing;
+        # tips that reached max_segments are retired from it.
+        self.clock = 0
+        self._wakeups = []
+        self.tips = []
+        self.add_tip(self.RootTip(x, y, direction='down', tip_id=self.next_tip_id()))
+        root_occupancy.claim(*OccupancyGrid.cell_of(x, y), self.plant_id)
+        self.recount()
+
+    def next_tip_id(self):
+        return next(self._tip_ids)
+
+    def add_tip(self, tip):
+        """Add a tip; it first grows on the next tick."""
+        self.tips.append(tip)
+        tip.last_tick = self.clock
+        heapq.heappush(self._wakeups, (self.clock + 1, tip.tip_id, tip))
+
+    def due_tips(self):
+        """
+        Advance the clock one tick and return the tips that grow on it, each
+        caught up on the idle ticks it slept through.
+        """
+        self.clock += 1
+        due = []
+        while self._wakeups and self._wakeups[0][0] <= self.clock:
+            _, _, tip = heapq.heappop(self._wakeups)
+            skipped = self.clock - tip.last_tick - 1
+            if skipped > 0:
+                tip.growth_accumulator += skipped * tip.idle_increment
+                tip.ticks += skipped
+            due.append(tip)
+        return due
+
+    def schedule(self, tip):
+        """
+        Requeue a tip after it grew: saturated tips retire, others sleep through
+        their idle ticks (a boxed-in tip's idle ticks are its backoff).
+        """
+        tip.last_tick = self.clock
+        if len(tip.segments) >= tip.max_segments:
+            return
+        idle = tip.idle_ticks if type(tip).grow is Root.RootTip.grow else 0
+        heapq.heappush(self._wakeups, (self.clock + 1 + idle, tip.tip_id, tip))
+
+    def active_tip_count(self):
+        return len(self._wakeups)
+
+    def recount(self):
+        """Rebuild the incremental segment statistics and bounding box from the tips."""
+        self.segment_count = sum(len(tip.segments) for tip in self.tips)
+        self.min_x = min(float(tip.segments.column('x').min()) for tip in self.tips)
+        self.max_x = max(float(tip.segments.column('x').max()) for tip in self.tips)
+        self.min_y = min(float(tip.segments.column('y').min()) for tip in self.tips)
+        self.max_y = max(float(tip.segments.column('y').max()) for tip in self.tips)
+        self.version = getattr(self, 'version', 0) + 1
+
+    def record_segment(self, x, y):
+        """Account for a segment appended to one of the tips (or a new branch tip)."""
+        self.segment_count += 1
+        if x < self.min_x:
+            self.min_x = x
+        elif x > self.max_x:
+            self.max_x = x
+        if y < self.min_y:
+            self.min_y = y
+        elif y > self.max_y:
+            self.max_y = y
+        self.version += 1
+
+    def root_zone(self):
+        """Half-open (row0, row1, col0, col1) grid window covered by the root segments."""
+        return (int(self.min_y // CELL_SIZE), int(self.max_y // CELL_SIZE) + 1,
+                int(self.min_x // CELL_SIZE), int(self.max_x // CELL_SIZE) + 1)
     
     def get_horizon_resistance(self, row):
-        horizons = SOIL_TYPES[soil_properties['type']]['horizons']
-        cumulative_depth = 0
-        for horizon, properties in horizons.items():
-            depth = int(ROWS * properties['depth'])
-            if cumulative_depth <= row < cumulative_depth + depth:
-                return properties['resistance']
-            cumulative_depth += depth
-        return 1 
+        return soil_properties['horizon_index'].resistance_at_row(row)
 
     def grow(self):
         """
         Grow each active tip in the system.
         """
-        for tip in self.tips[:]:
-            tip.grow(self)
+        grow_root_systems([self])
 
     def absorb_moisture(self):
         """
-        Determine the available moisture for the plant from the soil beneath the roots.
-        Here we use the root's location to sample the soil grid.
+        Determine the available moisture for the plant from the soil around the roots:
+        the mean moisture over the root zone, read from the field's summed-area table.
         """
-        cell_x = int(self.x // CELL_SIZE)
-        cell_y = int(self.y // CELL_SIZE)
-        if 0 <= cell_y < len(soil_properties['grid']) and 0 <= cell_x < len(soil_properties['grid'][0]):
-            actual_moisture = soil_properties['grid'][cell_y][cell_x]['moisture']
-        else:
-            actual_moisture = 0
-
-        return actual_moisture
+        return soil_properties['grid'].region_mean('moisture', *self.root_zone())
 
     def absorb_nutrients(self):
         """
-        Determine the nutrient factor available to the plant via the roots.
+        Determine the nutrient factor available to the plant via the roots,
+        from the mean N/P/K over the root zone.
         """
-        nutrients = soil_properties['nutrients']
-        nutrient_factor = (
-            min(nutrients.get('nitrogen', 0) / 100.0, 1.0) +
-            min(nutrients.get('phosphorus', 0) / 100.0, 1.0) +
-            min(nutrients.get('potassium', 0) / 100.0, 1.0)
+        field = soil_properties['grid']
+        zone = self.root_zone()
+        nutrient_factor = sum(
+            min(field.region_mean(name, *zone) / ROOT_ZONE_NUTRIENT_SATURATION, 1.0)
+            for name in NUTRIENT_LAYERS
         ) / 3.0
         return nutrient_factor
 
@@ -226,60 +436,54 @@ class Root:
         Represents a single actively growing root tip.
         Each tip has its own chain of segments and can branch off new tips.
         """
-        def __init__(self, x, y, direction=None):
-            self.segments = [{'x': x, 'y': y, 'age': 0}]
-            self.occupied_positions = {(x, y)}
+        def __init__(self, x, y, direction=None, tip_id=0):
+            # Segments store their birth tick; age is derived as ticks - birth.
+            self.segments = SegmentArray(('x', 'y', 'birth'))
+            self.segments.append(x, y, 0)
+            self.ticks = 0
+            self.tip_id = tip_id
             self.growth_accumulator = 0.0
             self.growth_counter = 0
             self.direction = direction  
             self.max_width = 4
-            self.static_segments = []
+            self.static_segments = SegmentArray(('x', 'y'))
             self.max_segments = 70
             self.env_scores = {}
+            # Ticks the tip can sleep before its next segment, and the growth it
+            # accrues on each of them (see Root.due_tips).
+            self.idle_ticks = 0
+            self.idle_increment = 0.0
+            self.last_tick = 0
+            # Backoff, in ticks, while every neighbouring cell is occupied.
+            self.blocked_ticks = 0
 
     
 
-        def grow(self, root_system):
-
-            
+        def grow(self, root_system, scores=None):
+            """
+            Advance this tip by one tick. scores are the {direction: score}
+            candidates from score_root_tips; they are computed here if not given.
+            """
+            self.idle_ticks = 0
+            self.idle_increment = 0.0
             if len(self.segments) >= self.max_segments:
                 return
             
             daily_root_growth = 4
-            base_per_tick_growth = (daily_root_growth / sun.day_length) * TIME_SCALE
+            base_per_tick_growth = daily_root_growth * days_per_tick()
 
            
-            last_segment = self.segments[-1]
-            x, y = last_segment['x'], last_segment['y']
-            standard_dirs = ['left', 'right', 'down', 'up', 'down-left', 'down-right']
-            optimal_temp = 20.0
-            sigma = 10.0
-
-            for dkey in standard_dirs:
-                pos = directions[dkey](x, y)
-                grid_x = int(pos['x'] // CELL_SIZE)
-                grid_y = int(pos['y'] // CELL_SIZE)
-
-
-
-                if (0 <= grid_x < COLS and 0 <= grid_y < ROWS and (pos['x'], pos['y']) not in self.occupied_positions):
-                    cell = soil_properties['grid'][grid_y][grid_x]
-                    moisture = cell['moisture'] 
-                    local_temp = cell['temperature']
-                    resistance = root_system.get_horizon_resistance(grid_y)
-
-              
-                    temp_factor = math.exp(-((local_temp - optimal_temp) ** 2) / (2 * sigma ** 2))
-                    nutrient_factor = root_system.absorb_nutrients()  
-        
-
-                    score = (
-                        (W_hydro * (moisture / resistance)) *
-                        (W_thermo * temp_factor) *
-                        (W_chemo * nutrient_factor) *
-                        (W_geo   * GEOTROPISM_WEIGHTS[dkey])
-                    )
-                    self.env_scores[dkey] = score
+            x, y, _ = self.segments.last()
+            if scores is None:
+                scores = score_root_tips([(self, root_system)])[0]
+            if not scores:
+                # Boxed in: no free neighbour to grow into. Sleep, doubling the
+                # wait each time, until a neighbouring cell frees up.
+                self.blocked_ticks = min(max(1, 2 * self.blocked_ticks), MAX_BLOCKED_BACKOFF)
+                self.idle_ticks = self.blocked_ticks
+                return
+            self.blocked_ticks = 0
+            self.env_scores.update(scores)
 
 
             # --- Choose a Direction ---
@@ -292,7 +496,7 @@ class Root:
                 return
 
             env_factor = self.env_scores.get(chosen_direction, 1.0)
-            pH_value = SOILPH
+            pH_value = soil.SOILPH
             optimal_pH = 7.0
             pH_sigma = 0.5
             pH_factor = math.exp(-((pH_value - optimal_pH) ** 2) / (2 * pH_sigma ** 2))
@@ -310,20 +514,15 @@ class Root:
             if self.growth_accumulator >= threshold:
                 self.growth_accumulator -= threshold
                 new_segment = directions[chosen_direction](x, y)
-                new_segment['age'] = 0
-                self.segments.append(new_segment)
-                self.occupied_positions.add((new_segment['x'], new_segment['y']))
+                self.segments.append(new_segment['x'], new_segment['y'], self.ticks)
+                root_occupancy.claim(*OccupancyGrid.cell_of(new_segment['x'], new_segment['y']),
+                                     root_system.plant_id)
+                root_system.record_segment(new_segment['x'], new_segment['y'])
                 self.growth_counter += 1
 
                 if self.growth_counter % 5 == 0:
-                    self.static_segments.append({
-                        'x': new_segment['x'] - CELL_SIZE, 
-                        'y': new_segment['y'] + CELL_SIZE
-                    })
-                    self.static_segments.append({
-                        'x': new_segment['x'] + CELL_SIZE, 
-                        'y': new_segment['y'] + CELL_SIZE
-                    })
+                    self.static_segments.append(new_segment['x'] - CELL_SIZE, new_segment['y'] + CELL_SIZE)
+                    self.static_segments.append(new_segment['x'] + CELL_SIZE, new_segment['y'] + CELL_SIZE)
 
                 # --- Branching Logic ---
            
@@ -333,25 +532,33 @@ class Root:
                         by = new_segment['y']
                    
                         branch_dir = random.choice(['left-branch', 'right-branch'])
-                        branch_tip = root_system.RootTip(bx, by, direction=branch_dir)
-                        root_system.tips.append(branch_tip)
+                        branch_tip = root_system.RootTip(bx, by, direction=branch_dir,
+                                                         tip_id=root_system.next_tip_id())
+                        root_system.add_tip(branch_tip)
+                        root_system.record_segment(bx, by)
+
+            # --- Predict the ticks left before the accumulator next crosses the threshold ---
+            if growth_increment > 0:
+                self.idle_increment = growth_increment
+                self.idle_ticks = max(0, math.ceil((threshold - self.growth_accumulator) / growth_increment) - 1)
 
-            # --- Age All Segments ---
-            for seg in self.segments:
-                seg['age'] += 1
+            # --- Age All Segments (one tick on the tip's clock) ---
+            self.ticks += 1
+
+        def segment_ages(self):
+            return self.ticks - self.segments.column('birth')
 
         def draw(self, screen):
-            for i in range(len(self.segments) - 1):
-                start_pos = (self.segments[i]['x'], self.segments[i]['y'])
-                end_pos = (self.segments[i + 1]['x'], self.segments[i + 1]['y'])
-                width = min(1 + self.segments[i]['age'] // 10, self.max_width)
-                pygame.draw.line(screen, ROOT, start_pos, end_pos, width)
+            points = self.segments.rows()
+            widths = np.minimum(1 + self.segment_ages() // 10, self.max_width).astype(int).tolist()
+            for i in range(len(points) - 1):
+                start_pos = points[i][:2]
+                end_pos = points[i + 1][:2]
+                pygame.draw.line(screen, ROOT, start_pos, end_pos, widths[i])
 
-            for segment in self.static_segments:
-                pygame.draw.line(screen, ROOT, (segment['x'], segment['y']),
-                                 (segment['x'] + 1, segment['y'] - 1), 2)
-                pygame.draw.line(screen, ROOT, (segment['x'], segment['y']),
-                                 (segment['x'] - 1, segment['y'] - 1), 2)
+            for x, y in self.static_segments.rows():
+                pygame.draw.line(screen, ROOT, (x, y), (x + 1, y - 1), 2)
+                pygame.draw.line(screen, ROOT, (x, y), (x - 1, y - 1), 2)
 
 
 
@@ -372,7 +579,9 @@ class Plant:
         self.flower_bloom_growth = 0
         self.flower_bloom_start_height = 100
         self.roots = Root(self.x, self.y)
-        self.stem_segments = [{'x': self.x, 'y': self.y, 'height': 0}]
+        # The stem only keeps points where it actually changes direction.
+        self.stem_segments = Polyline(('x', 'y', 'height'), min_step=CELL_SIZE)
+        self.stem_segments.extend(self.x, self.y, 0)
         self.stem_width = 1
         self.age = 0.0
         self.shoot_delay = 2
@@ -388,6 +597,25 @@ class Plant:
         self.health = self.max_health
         self.alive = True
 
+        # Running totals of what the roots took out of the soil (see uptake.py).
+        self.uptake = dict.fromkeys(('moisture',) + NUTRIENT_LAYERS, 0.0)
+        self.last_uptake = dict(self.uptake)
+
+        # Bumped when a stat get_stats reports changes (age and uptake are read
+        # fresh on every call); the stats are cached per (version, roots.version).
+        self.version = 0
+        self._reported = None
+        self._stats_cache = (None, None)
+
+    def state_version(self):
+        return (self.version, self.roots.version)
+
+    def record_uptake(self, amounts):
+        """Credit one tick of soil uptake, {layer: amount}, to this plant."""
+        for name, amount in amounts.items():
+            self.uptake[name] += amount
+        self.last_uptake = amounts
+
     def get_daily_growth(self):
         """Return the average daily growth (in cm/day) for the current season."""
         switch_growth_height = 32 
@@ -399,14 +627,7 @@ class Plant:
             return 5.0
         
     def get_horizon_resistance(self, height):
-        horizons = SOIL_TYPES[soil_properties['type']]['horizons']
-        cumulative_depth = 0
-        for horizon, properties in horizons.items():
-            depth = int(ROWS * properties['depth'])
-            if cumulative_depth <= height < cumulative_depth + depth:
-                return properties['resistance']
-            cumulative_depth += depth
-        return 1 
+        return soil_properties['horizon_index'].resistance_at_row(height)
 
     def get_sunlight_factor(self):
         """
@@ -420,11 +641,12 @@ class Plant:
             "winter": 0.3
         }
       
-        return season_factors.get(current_season, 1.0)
+        return season_factors.get(weather.current_season, 1.0)
         
 
     def update_health(self, sunlight_factor, nutrient_factor, moisture_factor, temp, pH):
         self.resource_status.clear()
+        health_before = self.health
 
         optimal_pH = 7.0
         max_ph_deviation = 1.5
@@ -478,6 +700,9 @@ class Plant:
             health_recovery = 2  # Simple fixed recovery per tick
             self.health = min(self.max_health, self.health + health_recovery)
 
+        # The penalties and recovery above are per default-length tick.
+        self.health = min(self.max_health, health_before + (self.health - health_before)
+                          * time_scale_factor())
     
         if self.health <= 0:
             self.die("Accumulated stress")
@@ -487,24 +712,51 @@ class Plant:
 
     def die(self, reason="Unknown"):
         """Sets plant status to dead with a specific reason."""
+        self.version += 1
         self.alive = False
         self.death_reason = reason
+        # Dead roots no longer block the other plants' roots.
+        root_occupancy.release_plant(self.roots.plant_id)
         print(f"Plant died due to: {self.death_reason}.")
 
 
 
-    def grow(self):
+    def grow(self, grow_roots=True):
+        """
+        Advance the plant by one tick. grow_roots=False is used when the
+        caller already grew this plant's roots in a batched grow_root_systems pass.
+        """
+        self._grow(grow_roots)
+        reported = self.reported_state()
+        if reported != self._reported:
+            self._reported = reported
+            self.version += 1
+
+    def reported_state(self):
+        """The stats get_stats derives from shoot and health, at the precision they are shown."""
+        return (self.alive, round(self.shoot_height, 2), self.stem_segments.samples,
+                self.health_status(), tuple(self.resource_status))
+
+    def health_status(self):
+        health_ratio = self.health / self.max_health if self.max_health else 0
+        if health_ratio > 0.7:
+            return "healthy"
+        elif health_ratio < 0.3:
+            return "dying"
+        return "stable"
 
+    def _grow(self, grow_roots):
         # --- Grow the root system regardless of shoot delay ---
         if self.alive:
-            self.age += TIME_SCALE / sun.day_length
-            self.roots.grow()
+            self.age += days_per_tick()
+            if grow_roots:
+                self.roots.grow()
 
             # --- Grow the shoot only after the delay period ---
             if self.age >= self.shoot_delay:
                 # print(f"Plant is {self.age:.2f} days old.")
                 daily_growth = self.get_daily_growth()  
-                base_per_tick_growth = (daily_growth / sun.day_length) * TIME_SCALE
+                base_per_tick_growth = daily_growth * days_per_tick()
 
                 shoot_above_soil = self.y - self.shoot_height < SOIL_ROWS * CELL_SIZE
 
@@ -524,7 +776,7 @@ class Plant:
                     self.resource_status.append("Low nutrients")
                 
                 # For demonstration, assume if temperature is outside 10-35, we say "too hot/cold"
-                local_temp = SEASONS[current_season]['temperature']
+                local_temp = SEASONS[weather.current_season]['temperature']
                 optimal_temp = 20.0
                 sigma = 10.0
                 temp_factor = math.exp(-((local_temp - optimal_temp) ** 2) / (2 * sigma ** 2))
@@ -543,17 +795,13 @@ class Plant:
 
                 # print(f"Daily growth: {daily_growth:.2f} cm, Growth increment: {growth_increment:.2f} cm")
 
-                self.update_health(sunlight_factor, nutrient_factor, moisture_factor, local_temp, SOILPH)
+                self.update_health(sunlight_factor, nutrient_factor, moisture_factor, local_temp, soil.SOILPH)
                 if not self.alive:
                     return  
                 if self.shoot_height < self.max_height:
                     self.shoot_height += growth_increment
                     # print(f"Plant height: {self.shoot_height:.2f} cm")
-                    self.stem_segments.append({
-                        'x': self.x,
-                        'y': self.y - self.shoot_height,
-                        'height': self.shoot_height
-                    })
+                    self.stem_segments.extend(self.x, self.y - self.shoot_height, self.shoot_height)
 
                 if self.y - self.shoot_height < SOIL_ROWS * CELL_SIZE:
                     self.stem_above_soil = SOIL_ROWS * CELL_SIZE - (self.y - self.shoot_height)
@@ -581,16 +829,8 @@ class Plant:
                         self.flower_bloom_growth += growth_increment
 
     def get_root_depth(self):
-        """Compute the maximum vertical depth of the root system below the plant's starting y-coordinate."""
-        max_depth = 0
-        for tip in self.roots.tips:
-            for segment in tip.segments:
-              
-                if segment['y'] > self.y:
-                    depth = segment['y'] - self.y
-                    if depth > max_depth:
-                        max_depth = depth
-        return max_depth
+        """Maximum vertical depth of the root system below the plant's starting y-coordinate."""
+        return max(0, self.roots.max_y - self.y)
     
 
     def update_stage(self):
@@ -604,16 +844,25 @@ class Plant:
 
         print(f"Plant stage: {self.stage}")
 
+    def stats_key(self):
+        """Changes whenever anything get_stats reports changes, age and uptake included."""
+        return self.state_version() + (self.age, tuple(round(amount, 3) for amount in self.uptake.values()))
+
     def get_stats(self):
-        health_ratio = self.health / self.max_health if self.max_health else 0
-        if health_ratio > 0.7:
-            health_status = "healthy"
-        elif health_ratio < 0.3:
-            health_status = "dying"
-        else:
-            health_status = "stable"
-        stem_cells = len(self.stem_segments)
-        root_cells = sum(len(tip.segments) for tip in self.roots.tips)
+        cached_version, cached_stats = self._stats_cache
+        if cached_version != self.state_version():
+            cached_stats = self._slow_stats()
+            self._stats_cache = (self.state_version(), cached_stats)
+        stats = dict(cached_stats)
+        stats["age"] = self.age
+        stats["uptake"] = {name: round(amount, 3) for name, amount in self.uptake.items()}
+        return stats
+
+    def _slow_stats(self):
+        """The part of get_stats that only changes when version or roots.version does."""
+        health_status = self.health_status()
+        stem_cells = self.stem_segments.samples
+        root_cells = self.roots.segment_count
         root_depth = self.get_root_depth()
         weight = (stem_cells + root_cells) * 2 / 1000
         self.stage = self.update_stage()
@@ -627,7 +876,6 @@ class Plant:
             "weight": weight,
             "height": self.shoot_height,
             "root_depth": root_depth,
-            "age": self.age
         }
         if not self.alive:
             stats["death_reason"] = self.death_reason
@@ -639,14 +887,13 @@ class Plant:
     def draw(self, screen):
        
         if self.age >= self.shoot_delay:
-            for i in range(len(self.stem_segments) - 1):
-                start_pos = (self.stem_segments[i]['x'], self.stem_segments[i]['y'])
-                end_pos = (self.stem_segments[i + 1]['x'], self.stem_segments[i + 1]['y'])
-                self.stem_width = 0.5 + self.stem_above_soil // 20 if self.stem_above_soil > 0 else 1
-                pygame.draw.line(screen, SHOOT_COLOUR, start_pos, end_pos, int(self.stem_width))
+            stem_width = 0.5 + self.stem_above_soil // 20 if self.stem_above_soil > 0 else 1
+            if len(self.stem_segments) > 1:
+                stem_points = [point[:2] for point in self.stem_segments.rows()]
+                pygame.draw.lines(screen, SHOOT_COLOUR, False, stem_points, int(stem_width))
 
             top_x, top_y = self.x, self.y - self.shoot_height
-            cotyledon_offset = 15 + self.stem_width // 2
+            cotyledon_offset = 15 + stem_width // 2
             if self.cotyledon_sprout_height is not None:
                 cotyledon_y = self.y - min(self.shoot_height, self.cotyledon_sprout_height + self.cotyledon_stop_height)
             else:
@@ -751,8 +998,8 @@ class Plant:
             # Optionally, add texture to the disk (dots to represent seeds)
             seed_count = 50
             for _ in range(seed_count):
-                angle = random.uniform(0, 2 * math.pi)
-                distance = random.uniform(0, flower_disk_radius * 0.8)
+                angle = _DECOR_RNG.uniform(0, 2 * math.pi)
+                distance = _DECOR_RNG.uniform(0, flower_disk_radius * 0.8)
                 seed_x = center_x + math.cos(angle) * distance
                 seed_y = center_y + math.sin(angle) * distance
                 pygame.draw.circle(screen, (139, 69, 19), (int(seed_x), int(seed_y)), 2)  # Brown seed dots
@@ -0,0 +1,84 @@
+# plants/segments.py
+import math
+import numpy as np
+
+
+class SegmentArray:
+    """
+    Growable structure-of-arrays store for root and stem segments.
+    Each segment is one row of a contiguous float64 block (24 bytes for three
+    fields instead of a dict per segment); the block doubles when it fills up.
+    """
+    __slots__ = ('fields', '_index', '_data', '_size')
+
+    def __init__(self, fields, capacity=16):
+        self.fields = tuple(fields)
+        self._index = {name: i for i, name in enumerate(self.fields)}
+        self._data = np.zeros((capacity, len(self.fields)))
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, *values):
+        if self._size == len(self._data):
+            grown = np.zeros((2 * len(self._data), len(self.fields)))
+            grown[:self._size] = self._data[:self._size]
+            self._data = grown
+        self._data[self._size] = values
+        self._size += 1
+
+    def pop(self):
+        if self._size == 0:
+            raise IndexError("pop from empty SegmentArray")
+        self._size -= 1
+        return tuple(self._data[self._size].tolist())
+
+    def row(self, i):
+        """Return segment i (negative indices allowed) as a tuple of Python floats."""
+        if i < 0:
+            i += self._size
+        if not 0 <= i < self._size:
+            raise IndexError("segment index out of range")
+        return tuple(self._data[i].tolist())
+
+    def last(self):
+        return self.row(-1)
+
+    def column(self, name):
+        """Read-only view of one field over all stored segments."""
+        view = self._data[:self._size, self._index[name]]
+        view.flags.writeable = False
+        return view
+
+    def rows(self):
+        """All segments as a list of tuples, for drawing loops."""
+        return self._data[:self._size].tolist()
+
+
+class Polyline(SegmentArray):
+    """
+    SegmentArray holding a stem as a polyline.
+    extend() moves the last point instead of adding a new one when the new point
+    continues a straight run, or when the last step is still shorter than
+    min_step, so storage stays proportional to the visible geometry.
+    """
+    __slots__ = ('min_step', 'samples')
+
+    def __init__(self, fields, min_step, capacity=4):
+        super().__init__(fields, capacity)
+        self.min_step = min_step
+        self.samples = 0  # points offered to extend(), merged or not
+
+    def extend(self, *values):
+        self.samples += 1
+        n = self._size
+        if n >= 2:
+            x0, y0 = self._data[n - 2, :2].tolist()
+            x1, y1 = self._data[n - 1, :2].tolist()
+            x, y = values[0], values[1]
+            collinear = abs((x1 - x0) * (y - y0) - (y1 - y0) * (x - x0)) < 1e-9
+            if collinear or math.hypot(x1 - x0, y1 - y0) < self.min_step:
+                self._data[n - 1] = values
+                return
+        self.append(*values)
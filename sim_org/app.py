@@ -1,20 +1,24 @@
 import eventlet
 eventlet.monkey_patch()
 
-from flask import Flask, render_template, request, jsonify, Response
-from flask_socketio import SocketIO, emit
+from flask import Flask, render_template, request, jsonify, Response, abort
+from flask_socketio import SocketIO, emit, join_room, leave_room
+import functools
+import time
 import threading
-import pygame
-import io, base64
-from PIL import Image
+import base64
+import json
 import config
 import os
 os.environ["SDL_VIDEODRIVER"] = "dummy"  # Force headless mode
 
 import main as sim
+from sessions import (get_session, create_session, capture_frame, sessions, session_scheduler,
+                      SessionLimitError, DEFAULT_SESSION, FRAME_INTERVAL)
 
 
-from soil import SOIL_TYPES, SEASONS
+from soil import SOIL_TYPES
+from weather import SEASONS
 
 app = Flask(__name__)
 socketio = SocketIO(app, async_mode='eventlet')
@@ -22,31 +26,79 @@ socketio = SocketIO(app, async_mode='eventlet')
 @app.route('/')
 def index():
     return render_template('index.html')
-def capture_frame():
-    frame_str = pygame.image.tostring(sim.screen, 'RGB')
-    image = Image.frombytes('RGB', sim.SCREEN_SIZE, frame_str)
-    byte_io = io.BytesIO()
-    image.save(byte_io, 'JPEG')
-    data = byte_io.getvalue()
-    return base64.b64encode(data).decode('utf-8')
+def current_session():
+    """The session a request belongs to, from its ?session= argument; 404 if there is none."""
+    session = get_session(request.args.get('session') or DEFAULT_SESSION)
+    if session is None:
+        abort(404, description="Unknown session")
+    return session
+
+def in_session(view):
+    """Run a view with its session's state installed in the simulation modules."""
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        session = current_session()
+        session.touch()
+        with session:
+            return view(*args, **kwargs)
+    return wrapper
+
+@app.route('/create_session', methods=['POST'])
+def new_session():
+    """Start a new garden; the client passes the returned id as ?session=."""
+    try:
+        session = create_session()
+    except SessionLimitError as e:
+        return jsonify({'error': str(e)}), 503
+    return jsonify({'session': session.id})
 
 def frame_emitter():
     while True:
         try:
-            # print("Capturing frame now...")
-            frame_data = capture_frame()
-            # print("Frame length:", len(frame_data))
-            socketio.emit('frame', {'data': frame_data})
+            # Frames are rendered and encoded by the session scheduler, within
+            # its budget; each session's go only to the browsers in its room.
+            for session in list(sessions.values()):
+                frame_data, session.frame_data = session.frame_data, None
+                if session.viewers and frame_data:
+                    socketio.emit('frame', {'data': frame_data}, to=session.id)
         except Exception as e:
             print("Error in frame_emitter:", e)
-        socketio.sleep(0.2)
+        socketio.sleep(FRAME_INTERVAL)
 
+def session_loop():
+    """Step every session, within the scheduler's CPU budget, once per frame interval."""
+    while True:
+        started = time.perf_counter()
+        try:
+            session_scheduler.run_round()
+        except Exception as e:
+            print("Error in session_loop:", e)
+        socketio.sleep(max(0, FRAME_INTERVAL - (time.perf_counter() - started)))
 
 
 
+
+# Socket.IO client sid -> the session id it is watching.
+_viewers = {}
+
 @socketio.on('connect')
 def on_connect():
-    print("Client connected via SocketIO")
+    session = get_session(request.args.get('session') or DEFAULT_SESSION)
+    if session is None:
+        return False  # refuse the connection
+    join_room(session.id)
+    session.viewers += 1
+    session.touch()
+    _viewers[request.sid] = session.id
+    print("Client connected via SocketIO to session", session.id)
+
+@socketio.on('disconnect')
+def on_disconnect():
+    session_id = _viewers.pop(request.sid, None)
+    if session_id in sessions:
+        leave_room(session_id)
+        sessions[session_id].viewers -= 1
+        sessions[session_id].touch()
 
 
 
@@ -75,14 +127,16 @@ def on_connect():
 
 @app.route('/video_feed')
 def video_feed():
+    session = current_session()
     def generate():
         while True:
-            frame = capture_frame()
+            frame = base64.b64decode(capture_frame(session.screen))
             yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame.read() + b'\r\n')
+                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
     return Response(generate(), mimetype='multipart/x-mixed-replace; boundary=frame')
 
 @app.route('/set_overlay', methods=['POST'])
+@in_session
 def set_overlay():
     data = request.get_json()
     mode = data.get('mode', None)  
@@ -92,6 +146,7 @@ def set_overlay():
 
 
 @app.route('/mouse_event', methods=['POST'])
+@in_session
 def mouse_event():
     data = request.get_json()
     mouse_x = data['x']
@@ -100,21 +155,23 @@ def mouse_event():
     seed_type = data.get('seed_type', 'normal')
     print(f"Mouse event type: {data['type']} / seed_type: {seed_type}")
     if data.get('type') == 'water':
-        sim.water_blocks.append(sim.WaterBlock(mouse_x, mouse_y, size))
+        sim.simulation.add_water(mouse_x, mouse_y, size)
     else:
-        sim.seeds.append(sim.Seed(mouse_x, mouse_y))
+        sim.simulation.add_seed(mouse_x, mouse_y)
     return '', 204
 
 @app.route('/set_soil_type', methods=['POST'])
+@in_session
 def set_soil_type():
     data = request.get_json()
     soil_type = data['soil_type']
     if soil_type in SOIL_TYPES:
-        sim.set_soil_type(soil_type)
+        sim.simulation.set_soil_type(soil_type)
         print(f"Soil type set to {soil_type}")
     return '', 204
 
 @app.route('/update_mouse', methods=['POST'])
+@in_session
 def update_mouse():
     data = request.get_json()
 
@@ -124,6 +181,7 @@ def update_mouse():
 
 
 @app.route('/toggle_soil_info', methods=['POST'])
+@in_session
 def toggle_soil_info():
   
     sim.display_info_mode = not sim.display_info_mode
@@ -131,91 +189,75 @@ def toggle_soil_info():
     return jsonify({"display_info": sim.display_info_mode})
 
 @app.route('/set_season', methods=['POST'])
+@in_session
 def set_season():
     data = request.get_json()
     season = data['season']
     if season in SEASONS:
-        sim.set_season(season)
+        sim.simulation.set_season(season)
         print(f"Season set to {season}")
     return '', 204
 
 @app.route('/set_time_of_day', methods=['POST'])
+@in_session
 def set_time_of_day():
     data = request.get_json()
     time_value = data.get('time', 0)
-    sim.set_time_of_day(time_value)
+    sim.simulation.set_time_of_day(time_value)
     print(f"Time of day set to {time_value}")
     return '', 204
 
 @app.route('/reset_simulation', methods=['POST'])
+@in_session
 def reset_simulation():
-    sim.seeds.clear()
-    sim.water_blocks.clear()
+    sim.simulation.reset()
     print("Simulation reset")
     return '', 204
 
 @app.route('/start_simulation', methods=['POST'])
+@in_session
 def start_simulation():
-    sim.start_simulation()
+    sim.simulation.start()
     print("Simulation started")
     return '', 204
 
 @app.route('/pause_simulation', methods=['POST'])
+@in_session
 def pause_simulation():
-    sim.pause_simulation()
+    sim.simulation.pause()
     print("Simulation paused")
     return '', 204
 
 @app.route('/get_plant_stats', methods=['GET'])
+@in_session
 def get_plant_stats():
-    stats_list = []
-    for seed in sim.seeds:
-        if seed.plant is not None:
-            if seed.plant.alive:
-                if seed.hydration >= seed.saturation_ratio:
-                    stats_list.append(seed.plant.get_stats())
-                else:
-                    stats_list.append(seed.get_stats())
-            else:
-                stats_list.append({
-                    "plant_type": seed.plant.plant_type,
-                    "stage": seed.plant.stage,
-                    "resource_status": "Dead",
-                    "time_to_germinate": seed.time_to_germinate,
-                    "health": "dead",
-                    "weight": 0,
-                    "height": 0,
-                    "root_depth": 0,
-                    "age": seed.age
-                })
-        else:
-            # Handle seeds that haven't germinated or don't have a plant
-            stats_list.append({
-                "plant_type": "seed",
-                "stage": "Not germinated",
-                "resource_status": "Not germinated",
-                "time_to_germinate": seed.time_to_germinate,
-                "health": "N/A",
-                "weight": 0,
-                "height": 0,
-                "root_depth": 0,
-                "age": seed.age
-            })
-    return jsonify(stats_list)
+    # Serialized payload, keyed by every seed's state_version().
+    cache = current_session().stats_cache
+    key = tuple(seed.state_version() for seed in sim.simulation.seeds)
+    if key != cache['key']:
+        cache['payload'] = json.dumps(sim.simulation.plant_stats())
+        cache['key'] = key
+    return Response(cache['payload'], mimetype='application/json')
 
 
 
 
 @app.route('/set_rain', methods=['POST'])
+@in_session
 def set_rain():
     data = request.get_json()
-    sim.raining = data.get('raining', sim.raining)
+    sim.simulation.raining = data.get('raining', sim.simulation.raining)
     if 'rain_intensity' in data:
-        sim.rain_intensity = data['rain_intensity']
-    return jsonify({"raining": sim.raining, "rain_intensity": sim.rain_intensity})
+        sim.simulation.rain_intensity = data['rain_intensity']
+    if 'footprint' in data:
+        footprint = data['footprint']
+        sim.simulation.rain_footprint = (int(footprint[0]), int(footprint[1])) if footprint else None
+    return jsonify({"raining": sim.simulation.raining, "rain_intensity": sim.simulation.rain_intensity,
+                    "footprint": sim.simulation.rain_footprint})
 
 
 @app.route('/set_time_scale', methods=['POST'])
+@in_session
 def set_time_scale():
     data = request.get_json()
     preset = data.get('preset', None)
@@ -234,6 +276,7 @@ def set_time_scale():
         return jsonify({"error": "Invalid preset"}), 400
 
 @app.route('/set_temperature', methods=['POST'])
+@in_session
 def set_temperature():
     data = request.get_json()
     new_temp = data.get('temperature', None)
@@ -250,6 +293,7 @@ def set_temperature():
 
 
 @app.route('/set_ph', methods=['POST'])
+@in_session
 def set_ph():
     data = request.get_json()
     new_ph = data.get('ph', None)
@@ -266,23 +310,18 @@ def set_ph():
 
 
 @app.route('/get_environment_info', methods=['GET'])
+@in_session
 def get_environment_info():
 
     from weather import SEASONS, current_season, sun
     import soil
  
-    grid = soil.soil_properties['grid']
-    total_moisture = 0
-    cells_count = 0
-    for row in grid:
-        for cell in row:
-            total_moisture += cell.get('moisture', 0)
-            cells_count += 1
+    field = soil.soil_properties['grid']
 
     conversion_factor = 0.5 
-    precipitation_value = sim.rain_intensity * conversion_factor if sim.raining else 0
+    precipitation_value = sim.simulation.rain_intensity * conversion_factor if sim.simulation.raining else 0
     precipitation = f"{precipitation_value:.1f} mm/h"
-    avg_moisture = total_moisture / cells_count if cells_count > 0 else 0
+    avg_moisture = field.mean('moisture')
 
     info = {
         "temperature": SEASONS[current_season]['temperature'],
@@ -299,8 +338,9 @@ def run_flask():
         socketio.run(app, host="0.0.0.0", port=port, debug=False, use_reloader=False)
         
 # Start background tasks using Socket.IO's built-in support.
+get_session(DEFAULT_SESSION)
 socketio.start_background_task(frame_emitter)
-socketio.start_background_task(sim.game_loop)
+socketio.start_background_task(session_loop)
 
 
 # if __name__ == '__main__':
@@ -320,6 +360,5 @@ if __name__ == '__main__':
 
     # Start the frame emitter as a background task
     socketio.start_background_task(frame_emitter)
-socketio.start_background_task(sim.game_loop)
     # # Now run your game loop (from main.py) in the main thread.
     # sim.game_loop()
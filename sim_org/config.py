@@ -1,13 +1,7 @@
 # config.py
 
-import pygame
-import os
 import math
 
-# Pygame initialization and screen configuration
-os.environ["SDL_VIDEODRIVER"] = "dummy"
-pygame.init()
-
 # Screen and cell configuration
 SCREEN_SIZE = (1200, 900)
 CELL_SIZE = 3
@@ -23,7 +17,8 @@ BLACK = (0, 0, 0)
 WATER = (0, 0, 139)
 
 # Simulation parameters
-TIME_SCALE = 600 / 2
+DEFAULT_TIME_SCALE = 600 / 2
+TIME_SCALE = DEFAULT_TIME_SCALE
 
 # Other constants and weight factors for growth, etc.
 W_geo = 1.0      
@@ -0,0 +1,159 @@
+# hydrology.py
+
+import numpy as np
+
+# Rates per simulated day for a cell of unit conductivity.
+DIFFUSIVITY = 0.5      # lateral spreading between neighbouring cells
+DRAINAGE_RATE = 1.0    # share of the water above the horizon's base moisture that drains down
+
+# The explicit stencil moves water out of a cell through three faces (left, right,
+# down); keeping every face coefficient at or below this keeps it stable and
+# stops any cell from being driven negative.
+MAX_FLUX_COEFFICIENT = 0.2
+
+SETTLE_THRESHOLD = 1e-4  # cells changing less than this in a step count as settled
+ACTIVE_MARGIN = 2        # cells added around the active region every step
+
+
+def conductivity_profile(soil_properties):
+    """Per-row conductivity, 1 / (moisture_retention * horizon resistance)."""
+    index = soil_properties['horizon_index']
+    return 1.0 / (soil_properties['moisture_retention'] * index.resistance)
+
+
+def merge_regions(a, b):
+    """Bounding box of two (row0, row1, col0, col1) windows; either may be None."""
+    if a is None:
+        return b
+    if b is None:
+        return a
+    return (min(a[0], b[0]), max(a[1], b[1]), min(a[2], b[2]), max(a[3], b[3]))
+
+
+class MoistureSolver:
+    """
+    Lateral diffusion plus gravity drainage of soil moisture.
+    Only the active region (cells still changing, grown by any tiles other code
+    wrote since the last step) is stepped; once the field settles the region is
+    None and a step costs a single tile-version comparison.
+    """
+    def __init__(self):
+        self.active = None
+        self.cells_in_region = 0  # cells a full-rate step would have covered
+        self.cells_stepped = 0
+        self.changes = []         # (window, moisture change) for each window of the last step
+        self._field = None
+        self._seen_versions = None
+
+    def _watch(self, field):
+        """Add tiles written elsewhere (water, rain, uptake) to the active region."""
+        if field is not self._field:
+            self._field = field
+            self._seen_versions = field.tile_versions.copy()
+            self.active = (0, field.rows, 0, field.cols)
+            return
+        changed = np.argwhere(field.tile_versions != self._seen_versions)
+        if len(changed):
+            (tile_row0, tile_col0), (tile_row1, tile_col1) = changed.min(axis=0), changed.max(axis=0)
+            row0, _, col0, _ = field.tile_bounds(int(tile_row0), int(tile_col0))
+            _, row1, _, col1 = field.tile_bounds(int(tile_row1), int(tile_col1))
+            self.active = merge_regions(self.active, (row0, row1, col0, col1))
+
+    def step(self, soil_properties, dt, active_cells=None, quiet_scale=1, windows=None):
+        """
+        Advance the moisture field by dt simulated days.
+        active_cells is an optional full-field bool mask (see soil_lod.py): faces
+        touching an active cell use dt and faces between two quiet cells use
+        quiet_scale * dt. windows optionally limits the step to a list of
+        (row0, row1, col0, col1) windows, which must not overlap.
+        """
+        field = soil_properties['grid']
+        self._watch(field)
+        self.cells_in_region = self.cells_stepped = 0
+        self.changes = []
+        if self.active is None:
+            return
+
+        row0, row1, col0, col1 = self.active
+        region = field.clip_region(row0 - ACTIVE_MARGIN, row1 + ACTIVE_MARGIN,
+                                   col0 - ACTIVE_MARGIN, col1 + ACTIVE_MARGIN)
+        self.cells_in_region = (region[1] - region[0]) * (region[3] - region[2])
+        partial = windows is not None
+        if not partial:
+            windows = [region]
+
+        moved = None
+        for window in windows:
+            row0, row1 = max(window[0], region[0]), min(window[1], region[1])
+            col0, col1 = max(window[2], region[2]), min(window[3], region[3])
+            if row1 - row0 < 2 or col1 - col0 < 2:
+                continue
+            window = (row0, row1, col0, col1)
+            change = self._step_window(soil_properties, window, dt, active_cells, quiet_scale)
+            self.cells_stepped += change.size
+            self.changes.append((window, change))
+
+            # Every cell the stencil wrote bumps its tile, however small the
+            # change; only cells above SETTLE_THRESHOLD keep the region active.
+            written = self._extent(change != 0, window)
+            if written is not None:
+                field.mark_dirty(*written)
+            moved = merge_regions(moved, self._extent(np.abs(change) > SETTLE_THRESHOLD, window))
+
+        # A partial step saw only part of the region, so it may grow it but not shrink it.
+        self.active = merge_regions(self.active, moved) if partial else moved
+        # Our own writes must not re-activate the region on the next step.
+        self._seen_versions[:] = field.tile_versions
+
+    @staticmethod
+    def _extent(mask, window):
+        """Bounding box, in field cells, of the True cells of a window's mask, or None."""
+        rows = np.flatnonzero(mask.any(axis=1))
+        if not len(rows):
+            return None
+        cols = np.flatnonzero(mask.any(axis=0))
+        row0, col0 = window[0], window[2]
+        return (row0 + int(rows[0]), row0 + int(rows[-1]) + 1,
+                col0 + int(cols[0]), col0 + int(cols[-1]) + 1)
+
+    def _step_window(self, soil_properties, window, dt, active_cells, quiet_scale):
+        """Apply the stencil inside one window and return the change it made."""
+        row0, row1, col0, col1 = window
+        field = soil_properties['grid']
+        moisture = field.moisture[row0:row1, col0:col1]
+        conductivity = conductivity_profile(soil_properties)[row0:row1, None]
+        base = soil_properties['horizon_index'].moisture[row0:row1, None]
+        change = np.zeros_like(moisture)
+        if active_cells is None:
+            lateral_scale = drainage_scale = bottom_scale = 1.0
+        else:
+            active = active_cells[row0:row1, col0:col1]
+            one, quiet = np.float32(1), np.float32(quiet_scale)
+            lateral_scale = np.where(active[:, :-1] | active[:, 1:], one, quiet)
+            drainage_scale = np.where(active[:-1] | active[1:], one, quiet)
+            bottom_scale = np.where(active[-1], one, quiet)
+
+        # Lateral diffusion between horizontal neighbours (same row, same conductivity).
+        lateral = np.minimum(DIFFUSIVITY * conductivity * dt * lateral_scale, MAX_FLUX_COEFFICIENT)
+        flux = lateral * (moisture[:, :-1] - moisture[:, 1:])
+        change[:, :-1] -= flux
+        change[:, 1:] += flux
+
+        # Gravity drainage of the excess over base moisture, limited by the
+        # less conductive of the two rows it passes between.
+        face = np.minimum(conductivity[:-1], conductivity[1:])
+        drainage = np.minimum(DRAINAGE_RATE * face * dt * drainage_scale, MAX_FLUX_COEFFICIENT)
+        drain = drainage * np.maximum(moisture[:-1] - base[:-1], 0)
+        change[:-1] -= drain
+        change[1:] += drain
+        if row1 == field.rows:
+            # The bottom row percolates out of the field.
+            bottom = np.minimum(DRAINAGE_RATE * conductivity[-1] * dt * bottom_scale,
+                                MAX_FLUX_COEFFICIENT)
+            change[-1] -= bottom * np.maximum(moisture[-1] - base[-1], 0)
+
+        np.maximum(moisture + change, 0, out=moisture)
+        return change
+
+
+moisture_solver = MoistureSolver()
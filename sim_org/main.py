@@ -1,29 +1,30 @@
 # main.py
 
+import os
+os.environ["SDL_VIDEODRIVER"] = "dummy"
 import pygame
 import math
 import random
 import threading
 import eventlet
-from soil import set_soil_type, soil_properties, initialize_soil_grid, SEASONS, draw_soil_horizons, SOIL_TYPES
-from Plants.plant import Seed
-from water import WaterBlock
-from weather import sun, moon, draw_sky, simulate_rain, update_and_draw_rain, set_season, current_season
-from config import SCREEN_SIZE, WHITE, CELL_SIZE, ROWS, COLS
-import os
-os.environ["SDL_VIDEODRIVER"] = "dummy"
+from soil import soil_properties, draw_soil_horizons
+from weather import draw_sky, update_and_draw_rain
+from overlay import OverlayRenderer, OVERLAY_MODES
+from simulation import Simulation
+from config import SCREEN_SIZE, WHITE, CELL_SIZE, ROWS
 
+pygame.init()
 screen = pygame.display.set_mode(SCREEN_SIZE)
 
 clock = pygame.time.Clock()
 screen_lock = threading.Lock()
 
-seeds = []
-water_blocks = []
-simulation_running = False
-rain_intensity = 1.0
-raining = False
+FRAME_RATE = 5
+TICKS_PER_FRAME = 1  # simulation ticks advanced per rendered frame
+
+simulation = Simulation()
 overlay_mode = None
+overlay_renderer = None
 
 
 display_info_mode = False
@@ -40,45 +41,38 @@ def get_soil_horizon_info(mouse_y):
     if mouse_y < soil_top_y or mouse_y > soil_bottom_y:
         return None
 
-    soil_depth = ROWS * CELL_SIZE  
-    horizons = SOIL_TYPES[soil_properties['type']]['horizons']
-    cumulative_height = 0
+    index = soil_properties['horizon_index']
+    horizon_key = index.key_at_y(mouse_y)
     info = None
 
-    for horizon_key, props in horizons.items():
-     
-        horizon_height = int(ROWS * props['depth'] * CELL_SIZE)
-        cumulative_height += horizon_height
-        horizon_bottom_y = soil_top_y + cumulative_height
-        if mouse_y <= horizon_bottom_y:
-     
-            horizon_name = props.get('name', props.get('Name', horizon_key))
-            description = props.get('description', 'No description')
-            composition = props.get('composition', 'N/A')
-            moisture = props.get('moisture', 'N/A')
-            nutrients = props.get('nutrients', {})
-            nitrogen = nutrients.get('nitrogen', 'N/A')
-            phosphorus = nutrients.get('phosphorus', 'N/A')
-            potassium = nutrients.get('potassium', 'N/A')
-            resistance = props.get('resistance', 'N/A')
-            airation = props.get('airation', 'N/A')
-
-
-            info = (
-                f"Horizon Key: {horizon_key}\n"
-                f"Name: {horizon_name}\n"
-                f"Description: {description}\n"
-                f"Composition: {composition}\n"
-                f"Moisture Scores: {moisture}\n"
-                f"Nutrients Scores:\n"
-                f"  - Nitrogen: {nitrogen}\n"
-                f"  - Phosphorus: {phosphorus}\n"
-                f"  - Potassium: {potassium}\n"
-                f"Resistance: {resistance}\n"
-            )
-            if airation != 'N/A':
-                info += f"Airation: {airation}\n"
-            break
+    if horizon_key is not None:
+        props = index.horizons[horizon_key]
+        horizon_name = props.get('name', props.get('Name', horizon_key))
+        description = props.get('description', 'No description')
+        composition = props.get('composition', 'N/A')
+        moisture = props.get('moisture', 'N/A')
+        nutrients = props.get('nutrients', {})
+        nitrogen = nutrients.get('nitrogen', 'N/A')
+        phosphorus = nutrients.get('phosphorus', 'N/A')
+        potassium = nutrients.get('potassium', 'N/A')
+        resistance = props.get('resistance', 'N/A')
+        airation = props.get('airation', 'N/A')
+
+
+        info = (
+            f"Horizon Key: {horizon_key}\n"
+            f"Name: {horizon_name}\n"
+            f"Description: {description}\n"
+            f"Composition: {composition}\n"
+            f"Moisture Scores: {moisture}\n"
+            f"Nutrients Scores:\n"
+            f"  - Nitrogen: {nitrogen}\n"
+            f"  - Phosphorus: {phosphorus}\n"
+            f"  - Potassium: {potassium}\n"
+            f"Resistance: {resistance}\n"
+        )
+        if airation != 'N/A':
+            info += f"Airation: {airation}\n"
 
     return info
 
@@ -103,76 +97,71 @@ def wrap_text(text, font, max_width):
 
 def set_overlay_mode(mode):
     global overlay_mode
-    if mode in ["moisture", "nutrients", "combined"]:
+    if mode in OVERLAY_MODES:
         overlay_mode = mode
     else:
         overlay_mode = None
     print("Overlay mode set to", overlay_mode)
 
 
-def interpolate_color(normalized):
-   
-    stops = [
-        (0.0, (255, 0, 0)),       # Red
-        (0.33, (255, 165, 0)),    # Orange
-        (0.66, (255, 255, 0)),    # Yellow
-        (1.0, (0, 0, 255))        # Blue
-    ]
-  
-    for i in range(len(stops) - 1):
-        low_val, low_color = stops[i]
-        high_val, high_color = stops[i + 1]
-        if normalized <= high_val:
+def draw_overlay_grid(screen, mode):
+    global overlay_renderer
+    field = soil_properties['grid']
+    if overlay_renderer is None:
+        overlay_renderer = OverlayRenderer(field.rows, field.cols)
+    overlay_renderer.draw(screen, field, mode, SCREEN_SIZE[1] // 2)
+
+
+
+
+
+def render(screen):
+    """Draw the current simulation state; nothing here advances the simulation."""
+    screen.fill(WHITE)
+    draw_sky(screen)
+
+    if simulation.raining:
+        update_and_draw_rain(screen, simulation.rain_intensity)
+
+    draw_soil_horizons(screen)
+    if overlay_mode is not None:
+        draw_overlay_grid(screen, overlay_mode)
+
+    for seed in simulation.seeds:
+        seed.draw(screen)
+    for water_block in simulation.water_blocks:
+        water_block.draw(screen)
+
+    # Draw the soil info popup if enabled and text exists
+    if display_info_mode and soil_info_text:
+      
+        lines = soil_info_text.split('\n')
         
-            t = (normalized - low_val) / (high_val - low_val)
-            r = int(low_color[0] + t * (high_color[0] - low_color[0]))
-            g = int(low_color[1] + t * (high_color[1] - low_color[1]))
-            b = int(low_color[2] + t * (high_color[2] - low_color[2]))
-            return (r, g, b)
-    return stops[-1][1]
 
-def draw_overlay_grid(screen, mode):
-    overlay_surface = pygame.Surface((COLS * CELL_SIZE, ROWS * CELL_SIZE), pygame.SRCALPHA)
-    for row_index, row in enumerate(soil_properties['grid']):
-        for col_index, cell in enumerate(row):
-            rect = pygame.Rect(col_index * CELL_SIZE, row_index * CELL_SIZE, CELL_SIZE, CELL_SIZE)
-            if mode == "moisture":
-                value = cell['moisture']
-                max_value = 5.0  
-                normalized = min(value, max_value) / max_value
-            elif mode == "nutrients":
-                nutrients = cell['nutrients']
-                total = nutrients['nitrogen'] + nutrients['phosphorus'] + nutrients['potassium']
-                max_value = 150  
-                normalized = min(total, max_value) / max_value
-            elif mode == "combined":
-                moisture_value = cell['moisture']
-                max_moisture = 5.0
-                normalized_moisture = min(moisture_value, max_moisture) / max_moisture
-                nutrients = cell['nutrients']
-                total = nutrients['nitrogen'] + nutrients['phosphorus'] + nutrients['potassium']
-                max_nutrient = 150
-                normalized_nutrient = min(total, max_nutrient) / max_nutrient
-                normalized = (normalized_moisture + normalized_nutrient) / 2.0
-          
-            base_color = interpolate_color(normalized)
-       
-            color = (*base_color, 150)
-            pygame.draw.rect(overlay_surface, color, rect)
-   
-    screen.blit(overlay_surface, (0, SCREEN_SIZE[1] // 2))
+        line_surfaces = [info_font.render(line, True, (0, 0, 0)) for line in lines]
+
 
+        line_height = info_font.get_linesize()
+        popup_width = max(surf.get_width() for surf in line_surfaces) + 10
+        popup_height = len(line_surfaces) * line_height + 10
 
 
+        popup_x = soil_info_pos[0] + 12
+        popup_y = soil_info_pos[1] - (popup_height + 12)
+        
 
+        if popup_y < 0:
+            popup_y = 0
 
-def start_simulation():
-    global simulation_running
-    simulation_running = True
+        popup_rect = pygame.Rect(popup_x, popup_y, popup_width, popup_height)
+        pygame.draw.rect(screen, (255,255,255), popup_rect)
+        pygame.draw.rect(screen, (0,0,0), popup_rect, 2)
 
-def pause_simulation():
-    global simulation_running
-    simulation_running = False
+   
+        y_offset = popup_y + 5
+        for surf in line_surfaces:
+            screen.blit(surf, (popup_x + 5, y_offset))
+            y_offset += line_height
 
 
 def game_loop():
@@ -193,7 +182,7 @@ def game_loop():
             elif event.type == pygame.MOUSEBUTTONDOWN:
                 if event.button == 1: 
                     mouse_x, mouse_y = event.pos
-                    seeds.append(Seed(mouse_x, mouse_y))
+                    simulation.add_seed(mouse_x, mouse_y)
         
 
         if display_info_mode:
@@ -204,73 +193,13 @@ def game_loop():
         else:
             soil_info_text = ""
 
-
+        if simulation.running:
+            simulation.step(TICKS_PER_FRAME)
+        else:
+            simulation.settle_seeds()
 
         with screen_lock:
-            screen.fill(WHITE)
-            if simulation_running:
-                sun.update()
-                moon.update()
-
-
-            
-
-            draw_sky(screen)
-
-            if raining:
-                simulate_rain(soil_properties, rain_intensity)
-                update_and_draw_rain(screen, rain_intensity)
-
-            draw_soil_horizons(screen)
-            if overlay_mode is not None:
-                draw_overlay_grid(screen, overlay_mode)
-
-
-            for seed in seeds:
-                seed.draw(screen, simulation_running)
-            for water_block in water_blocks:
-                water_block.draw(screen)
-
-         
-         
-
-            # Draw the soil info popup if enabled and text exists
-            if display_info_mode and soil_info_text:
-              
-                lines = soil_info_text.split('\n')
-                
-      
-                line_surfaces = [info_font.render(line, True, (0, 0, 0)) for line in lines]
-
-   
-                line_height = info_font.get_linesize()
-                popup_width = max(surf.get_width() for surf in line_surfaces) + 10
-                popup_height = len(line_surfaces) * line_height + 10
-
-       
-                popup_x = soil_info_pos[0] + 12
-                popup_y = soil_info_pos[1] - (popup_height + 12)
-                
-
-                if popup_y < 0:
-                    popup_y = 0
-
-                popup_rect = pygame.Rect(popup_x, popup_y, popup_width, popup_height)
-                pygame.draw.rect(screen, (255,255,255), popup_rect)
-                pygame.draw.rect(screen, (0,0,0), popup_rect, 2)
-
-           
-                y_offset = popup_y + 5
-                for surf in line_surfaces:
-                    screen.blit(surf, (popup_x + 5, y_offset))
-                    y_offset += line_height
-
-
-
-
-
+            render(screen)
             pygame.display.flip()
-            clock.tick(5)
+            clock.tick(FRAME_RATE)
             eventlet.sleep(0)
-
-
@@ -0,0 +1,58 @@
+# occupancy.py
+
+import numpy as np
+from config import ROWS, COLS, CELL_SIZE
+
+FREE = 0
+
+
+class OccupancyGrid:
+    """
+    Simulation-wide record of which plant's roots own each cell.
+    plant holds the owning plant's id (FREE when empty), so collision checks
+    are a single array read. A plant's cells are released when it dies.
+    """
+    def __init__(self, rows=ROWS, cols=COLS):
+        self.rows = rows
+        self.cols = cols
+        self.plant = np.zeros((rows, cols), dtype=np.int32)
+
+    @staticmethod
+    def cell_of(x, y):
+        """Map a pixel position to the (row, col) the root scorer uses."""
+        return int(y // CELL_SIZE), int(x // CELL_SIZE)
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def is_free(self, row, col):
+        """Off-grid cells count as taken."""
+        return self.in_bounds(row, col) and self.plant[row, col] == FREE
+
+    def free_mask(self, rows, cols):
+        """Vectorized is_free for parallel (in-bounds) row/col index arrays."""
+        return self.plant[rows, cols] == FREE
+
+    def claim(self, row, col, plant_id):
+        """Give a free cell to a plant. Returns False if it was taken or off-grid."""
+        if not self.is_free(row, col):
+            return False
+        self.plant[row, col] = plant_id
+        return True
+
+    def release(self, row, col, plant_id=None):
+        """Free a cell, optionally only if the given plant owns it."""
+        if not self.in_bounds(row, col):
+            return
+        if plant_id is None or self.plant[row, col] == plant_id:
+            self.plant[row, col] = FREE
+
+    def release_plant(self, plant_id):
+        """Free every cell a plant owns, e.g. when it dies."""
+        self.plant[self.plant == plant_id] = FREE
+
+    def clear(self):
+        self.plant.fill(FREE)
+
+
+root_occupancy = OccupancyGrid()
@@ -0,0 +1,105 @@
+# overlay.py
+
+import numpy as np
+import pygame
+from config import CELL_SIZE
+
+OVERLAY_MODES = ("moisture", "nutrients", "combined")
+OVERLAY_ALPHA = 150
+MAX_MOISTURE = 5.0
+MAX_NUTRIENTS = 150
+
+GRADIENT_STOPS = [
+    (0.0, (255, 0, 0)),       # Red
+    (0.33, (255, 165, 0)),    # Orange
+    (0.66, (255, 255, 0)),    # Yellow
+    (1.0, (0, 0, 255))        # Blue
+]
+
+
+def interpolate_color(normalized):
+    for i in range(len(GRADIENT_STOPS) - 1):
+        low_val, low_color = GRADIENT_STOPS[i]
+        high_val, high_color = GRADIENT_STOPS[i + 1]
+        if normalized <= high_val:
+            t = (normalized - low_val) / (high_val - low_val)
+            r = int(low_color[0] + t * (high_color[0] - low_color[0]))
+            g = int(low_color[1] + t * (high_color[1] - low_color[1]))
+            b = int(low_color[2] + t * (high_color[2] - low_color[2]))
+            return (r, g, b)
+    return GRADIENT_STOPS[-1][1]
+
+
+def build_gradient_lut(size=256):
+    """Sample interpolate_color into a (size, 3) uint8 lookup table."""
+    return np.array([interpolate_color(i / (size - 1)) for i in range(size)], dtype=np.uint8)
+
+
+GRADIENT_LUT = build_gradient_lut()
+
+
+def normalize_field(field, mode, rows=slice(None), cols=slice(None)):
+    """Normalise a window of the soil field to [0, 1] for the given overlay mode."""
+    if mode == "moisture":
+        return np.minimum(field.moisture[rows, cols], MAX_MOISTURE) / MAX_MOISTURE
+    nutrients = (field.nitrogen[rows, cols] + field.phosphorus[rows, cols]
+                 + field.potassium[rows, cols])
+    normalized_nutrient = np.minimum(nutrients, MAX_NUTRIENTS) / MAX_NUTRIENTS
+    if mode == "nutrients":
+        return normalized_nutrient
+    normalized_moisture = np.minimum(field.moisture[rows, cols], MAX_MOISTURE) / MAX_MOISTURE
+    return (normalized_moisture + normalized_nutrient) / 2.0
+
+
+def colorize(normalized):
+    """Map normalised values through the gradient LUT, giving (rows, cols, 3) uint8."""
+    indices = (np.clip(normalized, 0.0, 1.0) * (len(GRADIENT_LUT) - 1)).astype(np.intp)
+    return GRADIENT_LUT[indices]
+
+
+class OverlayRenderer:
+    """
+    Draws soil overlays by writing colors straight into a reused surface.
+    The field is rasterised at one pixel per cell and then scaled up by CELL_SIZE.
+    Only tiles whose SoilField version changed since the last frame are
+    redone; switching field or mode repaints everything once.
+    """
+    def __init__(self, rows, cols):
+        self.rows = rows
+        self.cols = cols
+        self.cell_surface = pygame.Surface((cols, rows))
+        self.surface = pygame.Surface((cols * CELL_SIZE, rows * CELL_SIZE))
+        self.surface.set_alpha(OVERLAY_ALPHA)
+        self._field = None
+        self._mode = None
+        self._seen_versions = None
+        self.tiles_repainted = 0
+
+    def _paint(self, field, mode, row0, row1, col0, col1):
+        rgb = colorize(normalize_field(field, mode, slice(row0, row1), slice(col0, col1)))
+        cell_rect = pygame.Rect(col0, row0, col1 - col0, row1 - row0)
+        cell_tile = self.cell_surface.subsurface(cell_rect)
+        # surfarray is indexed [x, y], the field is [row, col].
+        pygame.surfarray.blit_array(cell_tile, rgb.transpose(1, 0, 2))
+        pixel_rect = pygame.Rect(col0 * CELL_SIZE, row0 * CELL_SIZE,
+                                 cell_rect.width * CELL_SIZE, cell_rect.height * CELL_SIZE)
+        pygame.transform.scale(cell_tile, pixel_rect.size, self.surface.subsurface(pixel_rect))
+
+    def render(self, field, mode):
+        if field is not self._field or mode != self._mode:
+            self._paint(field, mode, 0, field.rows, 0, field.cols)
+            self._field = field
+            self._mode = mode
+            self._seen_versions = field.tile_versions.copy()
+            self.tiles_repainted = field.tile_rows * field.tile_cols
+            return self.surface
+
+        dirty = np.argwhere(field.tile_versions != self._seen_versions)
+        for tile_row, tile_col in dirty:
+            self._paint(field, mode, *field.tile_bounds(tile_row, tile_col))
+        self._seen_versions[:] = field.tile_versions
+        self.tiles_repainted = len(dirty)
+        return self.surface
+
+    def draw(self, screen, field, mode, top):
+        screen.blit(self.render(field, mode), (0, top))
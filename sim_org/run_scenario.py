@@ -0,0 +1,168 @@
+# run_scenario.py
+"""
+Run a scenario headless, as fast as the CPU allows: no pygame window, no Flask.
+
+    python run_scenario.py scenario.json --days 21 --output stats.json --snapshots run.jsonl
+
+A scenario is a JSON object; every key is optional:
+
+    {
+        "soil_type": "loam",
+        "season": "spring",
+        "ph": 6.5,
+        "temperature": 22,
+        "time_scale": 300,
+        "seeds": [{"x": 300, "y": 300, "seed_type": "small"}],
+        "water": [{"x": 300, "y": 600, "size": 4}],
+        "rain": {"intensity": 1.0, "footprint": [0, 100]},
+        "days": 14,
+        "snapshot_every": 1
+    }
+
+days defaults to 7 and snapshots are off unless snapshot_every is set.
+time_scale sets how many simulated days a tick covers (0.5 at the default
+300 in spring). Rates are per day, so results agree across time scales up
+to tick granularity: a root tip still adds at most one segment per tick, so
+large time scales run faster but grow coarser root systems.
+The final output is the same list /get_plant_stats returns. Snapshots are
+written one JSON object per line every snapshot_every simulated days.
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import time
+
+# Keep stdout clean for the JSON output.
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import config
+import soil
+import weather
+from soil import SOIL_TYPES
+from soil_field import NUTRIENT_LAYERS
+from Plants.germination import days_per_tick
+from simulation import Simulation
+
+
+def load_scenario(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def apply_scenario(simulation, scenario):
+    """Set up the soil, weather, seeds and water a scenario describes."""
+    if 'soil_type' in scenario:
+        if scenario['soil_type'] not in SOIL_TYPES:
+            raise ValueError(f"Unknown soil type {scenario['soil_type']!r}")
+        simulation.set_soil_type(scenario['soil_type'])
+    if 'season' in scenario:
+        if scenario['season'] not in weather.SEASONS:
+            raise ValueError(f"Unknown season {scenario['season']!r}")
+        simulation.set_season(scenario['season'])
+    if 'temperature' in scenario:
+        weather.SEASONS[weather.current_season]['temperature'] = float(scenario['temperature'])
+    if 'ph' in scenario:
+        soil.SOILPH = float(scenario['ph'])
+    if 'time_scale' in scenario:
+        config.TIME_SCALE = float(scenario['time_scale'])
+
+    for seed in scenario.get('seeds', []):
+        simulation.add_seed(seed['x'], seed['y'], seed.get('seed_type', 'small'))
+    # The fall to the surface is an on-screen animation that takes a fixed
+    # number of ticks, i.e. more or fewer days depending on the time scale;
+    # land the seeds before the clock starts.
+    while not all(seed.on_ground for seed in simulation.seeds):
+        simulation.settle_seeds()
+    for water in scenario.get('water', []):
+        simulation.add_water(water['x'], water['y'], int(water.get('size', 4)))
+    if 'rain' in scenario:
+        rain = scenario['rain']
+        simulation.raining = True
+        simulation.rain_intensity = rain.get('intensity', 1.0)
+        footprint = rain.get('footprint')
+        simulation.rain_footprint = (int(footprint[0]), int(footprint[1])) if footprint else None
+
+
+def soil_summary():
+    """Field-wide means of the soil layers."""
+    field = soil.soil_properties['grid']
+    return {name: field.mean(name) for name in ('moisture',) + NUTRIENT_LAYERS}
+
+
+def snapshot(simulation):
+    return {
+        'tick': simulation.tick,
+        'day': simulation.tick * days_per_tick(),
+        'soil': soil_summary(),
+        'plants': simulation.plant_stats(),
+    }
+
+
+def run_scenario(scenario, days=None, snapshot_every=None, on_snapshot=None):
+    """
+    Build a Simulation from a scenario, run it for the given number of
+    simulated days and return its final plant stats. on_snapshot is called
+    with a snapshot dict every snapshot_every days.
+    """
+    simulation = Simulation()
+    apply_scenario(simulation, scenario)
+    days = scenario.get('days', 7) if days is None else days
+    snapshot_every = scenario.get('snapshot_every') if snapshot_every is None else snapshot_every
+
+    ticks_per_day = 1.0 / days_per_tick()
+    total_ticks = int(round(days * ticks_per_day))
+    snapshot_ticks = max(1, int(round(snapshot_every * ticks_per_day))) if snapshot_every else None
+
+    simulation.start()
+    while simulation.tick < total_ticks:
+        ticks = total_ticks - simulation.tick
+        if snapshot_ticks:
+            ticks = min(ticks, snapshot_ticks - simulation.tick % snapshot_ticks)
+        simulation.step(ticks)
+        if on_snapshot and snapshot_ticks and simulation.tick % snapshot_ticks == 0:
+            on_snapshot(snapshot(simulation))
+    return simulation.plant_stats()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a plant simulator scenario without a display.")
+    parser.add_argument('scenario', help="scenario JSON file")
+    parser.add_argument('--days', type=float, help="simulated days to run (overrides the scenario)")
+    parser.add_argument('--snapshot-every', type=float, help="days between snapshots (overrides the scenario)")
+    parser.add_argument('--output', '-o', default='-', help="file for the final stats, '-' for stdout")
+    parser.add_argument('--snapshots', help="JSON-lines file for the periodic snapshots")
+    parser.add_argument('--verbose', '-v', action='store_true', help="keep the simulation's own console output")
+    args = parser.parse_args(argv)
+
+    scenario = load_scenario(args.scenario)
+    snapshots = open(args.snapshots, 'w') if args.snapshots else None
+
+    def write_snapshot(data):
+        snapshots.write(json.dumps(data) + '\n')
+        snapshots.flush()
+
+    started = time.perf_counter()
+    # The plant and soil code print every tick; at thousands of ticks a
+    # second that is mostly terminal I/O, so it is dropped unless asked for.
+    with open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(sys.stdout if args.verbose else devnull):
+        stats = run_scenario(scenario, args.days, args.snapshot_every,
+                             write_snapshot if snapshots else None)
+    elapsed = time.perf_counter() - started
+    if snapshots:
+        snapshots.close()
+
+    if args.output == '-':
+        json.dump(stats, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    else:
+        with open(args.output, 'w') as f:
+            json.dump(stats, f, indent=2)
+    print(f"Ran {args.scenario} in {elapsed:.1f}s", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
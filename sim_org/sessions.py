@@ -0,0 +1,286 @@
+# sessions.py
+
+import base64
+import copy
+import io
+import secrets
+import threading
+import time
+import pygame
+from PIL import Image
+import config
+import soil
+import weather
+import main
+from config import SCREEN_SIZE
+from simulation import Simulation
+from occupancy import OccupancyGrid, root_occupancy
+from Plants.germination import GerminationScheduler, germination_scheduler
+from soil_lod import SoilScheduler, soil_scheduler
+from hydrology import MoistureSolver, moisture_solver
+
+DEFAULT_SESSION = 'default'
+FRAME_INTERVAL = 0.2     # seconds between scheduler rounds (the old 5 FPS game loop)
+FRAME_BUDGET = 0.15      # CPU seconds one round may spend stepping and rendering sessions
+SESSION_TIMEOUT = 3600   # seconds an unwatched, untouched session is kept
+MAX_SESSIONS = 16        # live sessions, default included; each holds a field and a screen (~7 MB)
+
+# Module state a fresh session starts from, as it was at import time.
+_DEFAULT_SEASONS = copy.deepcopy(weather.SEASONS)
+_DEFAULT_SEASON = weather.current_season
+_DEFAULT_SOIL_TYPE = soil.soil_properties['type']
+_DEFAULT_PH = soil.SOILPH
+_DEFAULT_TIME_SCALE = config.TIME_SCALE
+
+# The simulation modules keep their state in module globals, so only one
+# session can be installed in them at a time.
+_active_lock = threading.RLock()
+
+# Singletons other modules bind at import; a session swaps their __dict__.
+_SINGLETONS = (root_occupancy, germination_scheduler, soil_scheduler, moisture_solver)
+# main.py globals holding per-session overlay/UI state.
+UI_STATE = ('overlay_mode', 'overlay_renderer', 'display_info_mode', 'soil_info_text', 'soil_info_pos')
+
+
+class SessionLimitError(RuntimeError):
+    """Raised when a new session would go over MAX_SESSIONS."""
+
+
+def _installed():
+    """The module state a session swaps in and out, as it is installed right now."""
+    return {
+        'soil': dict(soil.soil_properties),
+        'seasons': dict(weather.SEASONS),
+        'season': weather.current_season,
+        'sun': weather.sun,
+        'moon': weather.moon,
+        'rain_particles': weather.rain_particles,
+        'ph': soil.SOILPH,
+        'time_scale': config.TIME_SCALE,
+        'shared': [singleton.__dict__ for singleton in _SINGLETONS],
+        'simulation': main.simulation,
+        'screen': main.screen,
+        'ui': {name: getattr(main, name) for name in UI_STATE},
+    }
+
+
+def _install(state):
+    soil.soil_properties.clear()
+    soil.soil_properties.update(state['soil'])
+    # Keep the SEASONS dict itself (modules import it by name) but hand it
+    # the state's per-season dicts, so edits to them stay with that state.
+    weather.SEASONS.update(state['seasons'])
+    weather.current_season = state['season']
+    weather.sun, weather.moon = state['sun'], state['moon']
+    weather.rain_particles = state['rain_particles']
+    soil.SOILPH = state['ph']
+    config.TIME_SCALE = state['time_scale']
+    for singleton, attributes in zip(_SINGLETONS, state['shared']):
+        singleton.__dict__ = attributes
+    main.simulation = state['simulation']
+    main.screen = state['screen']
+    for name, value in state['ui'].items():
+        setattr(main, name, value)
+
+
+def capture_frame(surface):
+    """A surface as a base64 JPEG, the form the browser's <img> takes."""
+    frame_str = pygame.image.tostring(surface, 'RGB')
+    image = Image.frombytes('RGB', surface.get_size(), frame_str)
+    byte_io = io.BytesIO()
+    image.save(byte_io, 'JPEG')
+    return base64.b64encode(byte_io.getvalue()).decode('utf-8')
+
+
+class SimulationSession:
+    """
+    One user's garden: soil field, weather, seeds and plants, schedulers,
+    overlay/UI state and screen. The simulation code reads module globals, so
+    the session installs its state in them on activate() and, on
+    deactivate(), reads it back and puts back whatever was installed before;
+    use it as a context manager around anything that touches the simulation.
+
+    The singletons other modules bind at import (root_occupancy,
+    germination_scheduler, soil_scheduler, moisture_solver) cannot be
+    rebound. Instead each session keeps its own instance and, while it is
+    active, the singleton is pointed at that instance's __dict__.
+    """
+    def __init__(self, session_id):
+        self.id = session_id
+        seasons = copy.deepcopy(_DEFAULT_SEASONS)
+        day_length = seasons[_DEFAULT_SEASON]['day_length']
+        self.simulation = Simulation()
+        self.screen = pygame.Surface(SCREEN_SIZE)
+        self._state = {
+            'soil': self._fresh_soil(_DEFAULT_SOIL_TYPE),
+            'seasons': seasons,
+            'season': _DEFAULT_SEASON,
+            'sun': weather.Sun(SCREEN_SIZE[0], SCREEN_SIZE[1], day_length),
+            'moon': weather.Moon(SCREEN_SIZE[0], SCREEN_SIZE[1], day_length),
+            'rain_particles': weather.RainParticles(),
+            'ph': _DEFAULT_PH,
+            'time_scale': _DEFAULT_TIME_SCALE,
+            'shared': [OccupancyGrid().__dict__, GerminationScheduler().__dict__,
+                       SoilScheduler().__dict__, MoistureSolver().__dict__],
+            'simulation': self.simulation,
+            'screen': self.screen,
+            'ui': {
+                'overlay_mode': None,
+                'overlay_renderer': None,
+                'display_info_mode': False,
+                'soil_info_text': "",
+                'soil_info_pos': (0, 0),
+            },
+        }
+        self._outer = []   # state installed before each activate(), innermost last
+        self.stats_cache = {'key': None, 'payload': None}
+        self.viewers = 0
+        self.frame_data = None  # base64 JPEG of the last rendered frame, not yet emitted
+        self.step_time = 0.0    # CPU seconds of the last step, render and encode
+        self.last_used = time.monotonic()
+
+    @staticmethod
+    def _fresh_soil(soil_type):
+        properties = soil.SOIL_TYPES[soil_type]
+        return {
+            'type': soil_type,
+            'color': properties['color'],
+            'moisture_retention': properties['moisture_retention'],
+            'airation': properties['airation'],
+            'nutrients': properties['nutrients'],
+            'horizon_index': soil.get_horizon_index(soil_type),
+            'grid': soil.initialize_soil_grid(soil_type),
+        }
+
+    def activate(self):
+        _active_lock.acquire()
+        if self.is_installed():
+            # Already installed (a nested with-block): nothing to swap.
+            self._outer.append(None)
+        else:
+            self._outer.append(_installed())
+            _install(self._state)
+        return self
+
+    def deactivate(self):
+        try:
+            outer = self._outer.pop()
+            if outer is not None:
+                self._state = _installed()
+                _install(outer)
+        finally:
+            _active_lock.release()
+
+    def is_installed(self):
+        return main.simulation is self.simulation
+
+    def __enter__(self):
+        return self.activate()
+
+    def __exit__(self, *exc):
+        self.deactivate()
+
+    def frame(self):
+        """
+        Advance by one frame's worth of ticks and, if anyone is watching,
+        render and encode it; the encoding counts against the frame budget.
+        """
+        started = time.perf_counter()
+        with self:
+            if self.simulation.running:
+                self.simulation.step(main.TICKS_PER_FRAME)
+            else:
+                self.simulation.settle_seeds()
+            if self.viewers:
+                if main.display_info_mode:
+                    info = main.get_soil_horizon_info(main.soil_info_pos[1])
+                    main.soil_info_text = info if info else ""
+                else:
+                    main.soil_info_text = ""
+                main.render(self.screen)
+        if self.viewers:
+            self.frame_data = capture_frame(self.screen)
+        self.step_time = time.perf_counter() - started
+
+    def touch(self):
+        """Note a request or viewer change; the scheduler's own frames do not count."""
+        self.last_used = time.monotonic()
+
+    def idle(self, now):
+        return not self.viewers and now - self.last_used > SESSION_TIMEOUT
+
+
+sessions = {}
+
+
+def get_session(session_id=None):
+    """
+    The session with this id, or None if there is none. Only the default
+    session is created here; every other one comes from create_session().
+    """
+    session_id = session_id or DEFAULT_SESSION
+    session = sessions.get(session_id)
+    if session is None and session_id == DEFAULT_SESSION:
+        session = sessions[session_id] = SimulationSession(session_id)
+    return session
+
+
+def create_session():
+    """Start a session under a fresh unguessable id; SessionLimitError when full."""
+    if len(sessions) >= MAX_SESSIONS:
+        session_scheduler.expire()
+    if len(sessions) >= MAX_SESSIONS:
+        raise SessionLimitError(f"{MAX_SESSIONS} sessions are already running")
+    session_id = secrets.token_urlsafe(12)
+    session = sessions[session_id] = SimulationSession(session_id)
+    return session
+
+
+class SessionScheduler:
+    """
+    Steps every session once per round, round-robin, within a CPU budget.
+    When a round runs out of budget the sessions it did not reach go first in
+    the next one, so a crowded process slows every garden down evenly
+    instead of starving the ones at the end of the list.
+    """
+    def __init__(self, frame_budget=FRAME_BUDGET):
+        self.frame_budget = frame_budget
+        self.rounds = 0
+        self.skipped = 0
+        self._next = 0
+
+    def run_round(self):
+        started = time.perf_counter()
+        order = list(sessions.values())
+        if not order:
+            return 0
+        start = self._next % len(order)
+        order = order[start:] + order[:start]
+        stepped = 0
+        for session in order:
+            if stepped and time.perf_counter() - started > self.frame_budget:
+                break
+            session.frame()
+            stepped += 1
+        self._next = start + stepped
+        self.skipped += len(order) - stepped
+        self.rounds += 1
+        self.expire()
+        return stepped
+
+    def expire(self):
+        now = time.monotonic()
+        for session_id, session in list(sessions.items()):
+            if session_id != DEFAULT_SESSION and session.idle(now):
+                del sessions[session_id]
+
+    def stats(self):
+        return {
+            'sessions': len(sessions),
+            'rounds': self.rounds,
+            'skipped': self.skipped,
+            'step_time': {session_id: session.step_time for session_id, session in sessions.items()},
+        }
+
+
+session_scheduler = SessionScheduler()
@@ -0,0 +1,139 @@
+# simulation.py
+
+import weather
+from soil import soil_properties, set_soil_type
+from Plants.plant import Seed, grow_root_systems
+from Plants.germination import germination_scheduler
+from water import WaterBlock
+from uptake import apply_root_uptake
+from soil_lod import soil_scheduler
+from occupancy import root_occupancy
+
+
+class Simulation:
+    """
+    Fixed-timestep simulation core.
+    step() advances weather, soil, seeds and plants by whole ticks and makes no
+    pygame calls. Rendering (main.py) only reads seeds, water_blocks and the
+    soil field, so the sim can run many ticks per frame or with no display.
+    """
+    def __init__(self):
+        self.seeds = []
+        self.water_blocks = []
+        self.running = False
+        self.raining = False
+        self.rain_intensity = 1.0
+        self.rain_footprint = None  # (start_col, end_col) to rain on part of the field only
+        self.tick = 0
+
+    def add_seed(self, x, y, seed_type="small"):
+        seed = Seed(x, y, seed_type)
+        self.seeds.append(seed)
+        return seed
+
+    def add_water(self, x, y, size=4):
+        water_block = WaterBlock(x, y, size)
+        self.water_blocks.append(water_block)
+        return water_block
+
+    def start(self):
+        self.running = True
+
+    def pause(self):
+        self.running = False
+
+    def reset(self):
+        """Remove every seed, plant and water block; soil and weather are kept."""
+        self.seeds.clear()
+        self.water_blocks.clear()
+        root_occupancy.clear()
+        germination_scheduler.clear()
+
+    def set_soil_type(self, soil_type):
+        set_soil_type(soil_type)
+
+    def set_season(self, season):
+        weather.set_season(season)
+
+    def set_time_of_day(self, time_value):
+        weather.set_time_of_day(time_value, weather.sun, weather.moon)
+
+    def growing_plants(self):
+        return [seed.plant for seed in self.seeds
+                if seed.germinated and seed.plant and seed.plant.alive]
+
+    def plant_stats(self):
+        """Stats for every seed and its plant, as served by /get_plant_stats."""
+        stats_list = []
+        for seed in self.seeds:
+            if seed.plant is not None:
+                if seed.plant.alive:
+                    if seed.hydration >= seed.saturation_ratio:
+                        stats_list.append(seed.plant.get_stats())
+                    else:
+                        stats_list.append(seed.get_stats())
+                else:
+                    stats_list.append({
+                        "plant_type": seed.plant.plant_type,
+                        "stage": seed.plant.stage,
+                        "resource_status": "Dead",
+                        "time_to_germinate": seed.time_to_germinate,
+                        "health": "dead",
+                        "weight": 0,
+                        "height": 0,
+                        "root_depth": 0,
+                        "age": seed.age
+                    })
+            else:
+                # Handle seeds that haven't germinated or don't have a plant
+                stats_list.append({
+                    "plant_type": "seed",
+                    "stage": "Not germinated",
+                    "resource_status": "Not germinated",
+                    "time_to_germinate": seed.time_to_germinate,
+                    "health": "N/A",
+                    "weight": 0,
+                    "height": 0,
+                    "root_depth": 0,
+                    "age": seed.age
+                })
+        return stats_list
+
+    def settle_seeds(self):
+        """Let sown seeds fall; the game loop also calls this while paused."""
+        for seed in self.seeds:
+            seed.apply_gravity()
+
+    def step(self, ticks=1):
+        """Advance the simulation by a whole number of fixed ticks."""
+        if ticks < 0 or int(ticks) != ticks:
+            raise ValueError(f"step() takes a whole, non-negative number of ticks, not {ticks!r}")
+        for _ in range(int(ticks)):
+            self._tick()
+
+    def _tick(self):
+        weather.sun.update()
+        weather.moon.update()
+        if self.raining:
+            weather.simulate_rain(soil_properties, self.rain_intensity, self.rain_footprint)
+        self.settle_seeds()
+
+        # Grow every plant's roots in one batched scoring pass, then let
+        # them all draw from the soil in one vectorized uptake step.
+        growing = self.growing_plants()
+        grow_root_systems([plant.roots for plant in growing])
+        apply_root_uptake(growing, soil_properties['grid'])
+        soil_scheduler.step(soil_properties, growing,
+                            [seed for seed in self.seeds if not seed.germinated])
+        # Writes are done for this tick: region queries (root zone means) below
+        # rebuild their summed-area tables once against the settled field.
+        soil_properties['grid'].settle()
+
+        for seed in self.seeds:
+            if seed.germinated and seed.plant:
+                seed.update_imbibition()
+                seed.plant.grow(grow_roots=False)
+
+        # Dormant seeds wake here; they germinate and start growing next tick.
+        germination_scheduler.step()
+        self.tick += 1
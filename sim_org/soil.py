@@ -1,9 +1,10 @@
 # soil.py
 import pygame
-import random
 import math
+import numpy as np
 from config import ROWS, COLS, CELL_SIZE, SCREEN_SIZE
-from weather import sun, current_season, SEASONS
+import weather
+from soil_field import SoilField, NUTRIENT_LAYERS
 
 SOILPH = 7.0
 
@@ -487,55 +488,102 @@ SOIL_TYPES = {
 
 current_soil_type = 'loam'
 
+# Color drawn for rows that fall below the last horizon.
+BEDROCK_GREY = (105, 105, 105)
 
-def print_moisture_grid(grid):
-    print("Moisture Grid:")
-    for j, row in enumerate(grid):
-        row_values = [f"{cell['moisture']:.1f}" for cell in row]
-        print(f"Row {j}: {', '.join(row_values)}")
 
-def initialize_soil_grid(soil_type):
-    """Initialize the soil grid based on soil type and its horizons."""
-    horizons = SOIL_TYPES[soil_type]['horizons']
-    grid = []
-    current_row = 0
+class HorizonIndex:
+    """
+    Precomputed row -> horizon table for a single soil type.
+    Built once per soil type so horizon lookups are O(1) instead of a walk
+    over the cumulative horizon depths. Rows below the last horizon map to
+    no horizon: resistance 1, no base moisture and bedrock grey.
+    """
+    def __init__(self, soil_type):
+        self.soil_type = soil_type
+        self.horizons = SOIL_TYPES[soil_type]['horizons']
+        self.soil_top = SCREEN_SIZE[1] // 2
+        self.bands = []  # (horizon key, start row, end row), end exclusive
+        self.row_keys = [None] * ROWS
+        self.resistance = np.ones(ROWS, dtype=np.float32)
+        self.moisture = np.zeros(ROWS, dtype=np.float32)
+        self.colors = np.tile(np.array(BEDROCK_GREY, dtype=np.uint8), (ROWS, 1))
+
+        current_row = 0
+        for key, properties in self.horizons.items():
+            depth = int(ROWS * properties['depth'])
+            end_row = min(current_row + depth, ROWS)
+            if end_row <= current_row:
+                continue
+            self.bands.append((key, current_row, end_row))
+            self.row_keys[current_row:end_row] = [key] * (end_row - current_row)
+            self.resistance[current_row:end_row] = properties['resistance']
+            self.moisture[current_row:end_row] = properties['moisture']
+            self.colors[current_row:end_row] = properties['color']
+            current_row = end_row
+
+        # A plain list is faster than NumPy for scalar lookups.
+        self._resistance_list = self.resistance.tolist()
+
+    def key_at_row(self, row):
+        row = int(row)
+        return self.row_keys[row] if 0 <= row < ROWS else None
+
+    def resistance_at_row(self, row):
+        row = int(row)
+        return self._resistance_list[row] if 0 <= row < ROWS else 1
+
+    def row_at_y(self, screen_y):
+        """Map a screen y coordinate to a soil grid row (may be off the grid)."""
+        return int((screen_y - self.soil_top) // CELL_SIZE)
+
+    def key_at_y(self, screen_y):
+        return self.key_at_row(self.row_at_y(screen_y))
+
+
+_horizon_indices = {}
+
+def get_horizon_index(soil_type=None):
+    """Return the cached HorizonIndex for a soil type (the current one by default)."""
+    if soil_type is None:
+        soil_type = soil_properties['type']
+    index = _horizon_indices.get(soil_type)
+    if index is None:
+        index = _horizon_indices[soil_type] = HorizonIndex(soil_type)
+    return index
+
+# Noise source for per-cell variation when a grid is (re)initialised.
+_rng = np.random.default_rng()
+
+
+def seed_rng(seed=None):
+    """Reseed the soil noise source, so grids built afterwards are reproducible."""
+    global _rng
+    _rng = np.random.default_rng(seed)
+
 
-    for horizon, properties in horizons.items():
-        depth = int(ROWS * properties['depth'])
+def initialize_soil_grid(soil_type, rng=None):
+    """
+    Initialize the soil field based on soil type and its horizons.
+    rng is the numpy Generator for the per-cell noise (the module's by default).
+    """
+    rng = _rng if rng is None else rng
+    index = get_horizon_index(soil_type)
+    field = SoilField(ROWS, COLS)
+
+    for horizon, start_row, end_row in index.bands:
+        properties = index.horizons[horizon]
+        band = (end_row - start_row, COLS)
         horizon_nutrients = properties.get('nutrients', {})
-        for _ in range(depth):
-            if current_row >= ROWS:
-                break
-            row_cells = []
-            for col in range(COLS):
-                base_moisture = properties['moisture']
-                # Reduce variation: change noise from std dev 2 to 0.5 for a more lax moisture variation.
-                moisture = max(0, base_moisture + random.gauss(0, 0.5))
-                nitrogen = max(0, horizon_nutrients.get('nitrogen', 0) + random.gauss(0, 2))
-                phosphorus = max(0, horizon_nutrients.get('phosphorus', 0) + random.gauss(0, 2))
-                potassium = max(0, horizon_nutrients.get('potassium', 0) + random.gauss(0, 2))
-                cell = {
-                    'moisture': moisture,
-                    'nutrients': {
-                        'nitrogen': nitrogen,
-                        'phosphorus': phosphorus,
-                        'potassium': potassium
-                    },
-                    'base_temperature': 15, 
-                    'temperature': 15  
-                }
-                row_cells.append(cell)
-            grid.append(row_cells)
-            current_row += 1
-
-    while len(grid) < ROWS:
-        row_cells = [{'moisture': 0,
-                      'nutrients': {'nitrogen': 0, 'phosphorus': 0, 'potassium': 0},
-                      'base_temperature': 15,
-                      'temperature': 15} for _ in range(COLS)]
-        grid.append(row_cells)
-    print_moisture_grid(grid)
-    return grid
+        # Moisture noise is kept lax (std dev 0.5); nutrients vary a little more.
+        field.moisture[start_row:end_row] = np.maximum(
+            0, properties['moisture'] + rng.normal(0, 0.5, band))
+        for name in NUTRIENT_LAYERS:
+            field.layer(name)[start_row:end_row] = np.maximum(
+                0, horizon_nutrients.get(name, 0) + rng.normal(0, 2, band))
+
+    # Rows below the last horizon keep the field defaults: no moisture or nutrients.
+    return field
 
 soil_properties = {
     'type': 'loam',
@@ -543,68 +591,45 @@ soil_properties = {
     'moisture_retention': SOIL_TYPES['loam']['moisture_retention'],
     'airation': SOIL_TYPES['loam']['airation'],
     'nutrients': SOIL_TYPES['loam']['nutrients'], 
+    'horizon_index': get_horizon_index('loam'),
     'grid': initialize_soil_grid('loam')
 }
 
-def update_soil_grid_temperature(soil_grid):
-    """
-    Updates the 'temperature' field for each cell in the soil grid.
-    Temperature is computed based on:
-      - The base (seasonal) temperature.
-      - Diurnal variation modeled with a cosine function.
-      - A depth factor that reduces amplitude with depth.
-      - A moisture factor that damps temperature variation in wetter areas.
-    """
-
-    # Global (seasonal) base temperature.
-    base_temp = SEASONS[current_season]['temperature']
+def diurnal_cycle():
+    """Cosine of the current diurnal phase, driven by the live sun angle."""
+    return math.cos(weather.sun.angle - math.pi / 2)
 
-   
-    diurnal_amplitude = 10.0  # degrees Celsius
+# Radial water-block kernels, keyed by block size.
+_moisture_kernels = {}
 
-    depth_decay = 5.0  
-   
-    moisture_decay = 10.0  
-
-  
-    phase = sun.angle - math.pi / 2
-
-    for i, row in enumerate(soil_grid):
-      
-        depth_factor = math.exp(-i / depth_decay)
-        for cell in row:
-            # Moisture factor: higher moisture dampens the amplitude.
-            moisture_factor = math.exp(-cell['moisture'] / moisture_decay)
-            effective_amplitude = diurnal_amplitude * depth_factor * moisture_factor
-            diurnal_variation = effective_amplitude * math.cos(phase)
-            cell['temperature'] = cell['base_temperature'] + diurnal_variation
+def get_moisture_kernel(size):
+    """(4*size+1)^2 kernel of (2*size - distance), zero outside the 2*size radius."""
+    kernel = _moisture_kernels.get(size)
+    if kernel is None:
+        max_distance = size * 2
+        offsets = np.arange(-max_distance, max_distance + 1)
+        distance = np.hypot(offsets[:, None], offsets[None, :])
+        kernel = np.where(distance <= max_distance, max_distance - distance, 0).astype(np.float32)
+        _moisture_kernels[size] = kernel
+    return kernel
 
 def update_moisture_gradient(x, y, size):
+    """Add a water block's moisture around grid cell (x, y) as one clipped slice-add."""
     x = int(x)
     y = int(y)
-    horizons = SOIL_TYPES[soil_properties['type']]['horizons']
-    max_distance = size * 2 
-
-    for i in range(-max_distance, max_distance + 1):
-        for j in range(-max_distance, max_distance + 1):
-            grid_x = x + i
-            grid_y = y + j
-            if 0 <= grid_x < COLS and 0 <= grid_y < ROWS:
-                distance = math.sqrt(i**2 + j**2)
-                if distance <= max_distance:
-                   
-                    cumulative_depth = 0
-                    for horizon, properties in horizons.items():
-                        depth = int(ROWS * properties['depth'])
-                        if cumulative_depth <= grid_y < cumulative_depth + depth:
-                            moisture_retention = properties['moisture']
-                            break
-                        cumulative_depth += depth
-
-                   
-                    moisture_increase = max(0, (size * 2 - distance) * moisture_retention)
-                 
-                    soil_properties['grid'][grid_y][grid_x]['moisture'] += moisture_increase
+    field = soil_properties['grid']
+    retention = soil_properties['horizon_index'].moisture
+    kernel = get_moisture_kernel(size)
+    max_distance = size * 2
+
+    top, left = y - max_distance, x - max_distance
+    row0, row1, col0, col1 = field.clip_region(top, y + max_distance + 1, left, x + max_distance + 1)
+    if row0 >= row1 or col0 >= col1:
+        return
+
+    window = kernel[row0 - top:row1 - top, col0 - left:col1 - left]
+    field.moisture[row0:row1, col0:col1] += window * retention[row0:row1, None]
+    field.mark_dirty(row0, row1, col0, col1)
 
 
 
@@ -615,34 +640,32 @@ def set_soil_type(soil_type):
     soil_properties['moisture_retention'] = SOIL_TYPES[soil_type]['moisture_retention']
     soil_properties['airation'] = SOIL_TYPES[soil_type]['airation']
     soil_properties['nutrients'] = SOIL_TYPES[soil_type]['nutrients']
+    soil_properties['horizon_index'] = get_horizon_index(soil_type)
     soil_properties['grid'] = initialize_soil_grid(soil_type)
+    invalidate_soil_background()
     print(f'Soil type set to {soil_type}')
 
 
+# Pre-rendered horizon background for the current soil type.
+_soil_background = {'type': None, 'surface': None}
+
+def invalidate_soil_background():
+    _soil_background['type'] = None
+    _soil_background['surface'] = None
+
+def render_soil_background(soil_type):
+    """Render the horizon bands for a soil type onto a surface the size of the soil grid."""
+    index = get_horizon_index(soil_type)
+    surface = pygame.Surface((COLS * CELL_SIZE, ROWS * CELL_SIZE))
+    surface.fill(BEDROCK_GREY)
+    for horizon, start_row, end_row in index.bands:
+        rect = pygame.Rect(0, start_row * CELL_SIZE, COLS * CELL_SIZE, (end_row - start_row) * CELL_SIZE)
+        surface.fill(index.horizons[horizon]['color'], rect)
+    return surface
+
 def draw_soil_horizons(screen):
-    horizons = SOIL_TYPES[soil_properties['type']]['horizons']
-    current_row = 0
-
-    for horizon, properties in horizons.items():
-        depth = int(ROWS * properties['depth'])
-        color = properties['color']
-        for _ in range(depth):
-            if current_row >= ROWS:
-                break
-            for col in range(COLS):
-                x = col * CELL_SIZE
-                y = current_row * CELL_SIZE + SCREEN_SIZE[1] // 2
-                rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-                pygame.draw.rect(screen, color, rect)
-              
-            current_row += 1
-
-   
-    while current_row < ROWS:
-        for col in range(COLS):
-            x = col * CELL_SIZE
-            y = current_row * CELL_SIZE + SCREEN_SIZE[1] // 2
-            rect = pygame.Rect(x, y, CELL_SIZE, CELL_SIZE)
-            pygame.draw.rect(screen, (105, 105, 105), rect)  
-         
-        current_row += 1
+    soil_type = soil_properties['type']
+    if _soil_background['type'] != soil_type:
+        _soil_background['surface'] = render_soil_background(soil_type)
+        _soil_background['type'] = soil_type
+    screen.blit(_soil_background['surface'], (0, soil_properties['horizon_index'].soil_top))
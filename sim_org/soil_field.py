@@ -0,0 +1,146 @@
+# soil_field.py
+
+import numpy as np
+
+NUTRIENT_LAYERS = ('nitrogen', 'phosphorus', 'potassium')
+LAYERS = ('moisture',) + NUTRIENT_LAYERS + ('temperature', 'base_temperature')
+
+# Side length, in cells, of the tiles used for change tracking.
+TILE_SIZE = 25
+
+# Soil temperature model: diurnal swing that decays with depth and is damped by moisture.
+DIURNAL_AMPLITUDE = 10.0  # degrees Celsius
+DEPTH_DECAY = 5.0
+MOISTURE_DECAY = 10.0
+
+
+class SoilField:
+    """
+    Structure-of-arrays soil grid.
+    Every layer is a contiguous (rows, cols) float32 array indexed as [row, col],
+    the same order the old grid[row][col] list of dicts used.
+
+    Writers call mark_dirty() for the window they changed. That bumps a
+    version counter on every TILE_SIZE x TILE_SIZE tile it touches, so
+    consumers such as the overlay can redo only the tiles that changed.
+    """
+    def __init__(self, rows, cols, base_temperature=15):
+        self.rows = rows
+        self.cols = cols
+        for name in LAYERS:
+            setattr(self, name, np.zeros((rows, cols), dtype=np.float32))
+        self.base_temperature.fill(base_temperature)
+        self.temperature.fill(base_temperature)
+        self.tile_rows = -(-rows // TILE_SIZE)
+        self.tile_cols = -(-cols // TILE_SIZE)
+        self.tile_versions = np.zeros((self.tile_rows, self.tile_cols), dtype=np.int64)
+        self.version = 0
+        # The version summed-area tables are built against; see settle().
+        self.settled_version = 0
+
+        # Per-row amplitude of the diurnal temperature swing.
+        self.depth_factor = (DIURNAL_AMPLITUDE
+                             * np.exp(-np.arange(rows) / DEPTH_DECAY)).astype(np.float32)
+        self._damping = None
+        self._damping_version = -1
+        # Summed-area tables per layer as (version, table); see summed_area().
+        self._summed_areas = {}
+
+    def layer(self, name):
+        """Return the full array for a layer, e.g. field.layer('moisture')."""
+        if name not in LAYERS:
+            raise KeyError(f"Unknown soil layer: {name}")
+        return getattr(self, name)
+
+    def in_bounds(self, row, col):
+        return 0 <= row < self.rows and 0 <= col < self.cols
+
+    def value(self, name, row, col, default=0.0):
+        """Read a single cell as a Python float, or default if it is off the grid."""
+        if not self.in_bounds(row, col):
+            return default
+        return float(self.layer(name)[row, col])
+
+    def clip_region(self, row0, row1, col0, col1):
+        """Clip a half-open [row0, row1) x [col0, col1) window to the grid."""
+        return (max(0, row0), min(self.rows, row1),
+                max(0, col0), min(self.cols, col1))
+
+    def mean(self, name):
+        return float(self.layer(name).mean())
+
+    def summed_area(self, name):
+        """
+        Summed-area table of a layer, padded with a leading zero row and column
+        so that table[r, c] is the sum of layer[:r, :c]. Rebuilt lazily on the
+        first query after settle(), so at most once per tick however many writes
+        and region queries the tick makes.
+        """
+        version, table = self._summed_areas.get(name, (-1, None))
+        if version != self.settled_version:
+            table = np.zeros((self.rows + 1, self.cols + 1))
+            np.cumsum(self.layer(name), axis=0, dtype=np.float64, out=table[1:, 1:])
+            np.cumsum(table[1:, 1:], axis=1, out=table[1:, 1:])
+            self._summed_areas[name] = (self.settled_version, table)
+        return table
+
+    def settle(self):
+        """
+        Mark the end of a tick's writes (rain, uptake, moisture solver). Region
+        queries see the field as of the last settle().
+        """
+        self.settled_version = self.version
+
+    def region_sum(self, name, row0, row1, col0, col1):
+        """O(1) sum of a layer over a half-open window, clipped to the grid."""
+        row0, row1, col0, col1 = self.clip_region(row0, row1, col0, col1)
+        if row0 >= row1 or col0 >= col1:
+            return 0.0
+        table = self.summed_area(name)
+        return float(table[row1, col1] - table[row0, col1] - table[row1, col0] + table[row0, col0])
+
+    def region_mean(self, name, row0, row1, col0, col1, default=0.0):
+        """O(1) mean of a layer over a half-open window, or default if it is off the grid."""
+        row0, row1, col0, col1 = self.clip_region(row0, row1, col0, col1)
+        if row0 >= row1 or col0 >= col1:
+            return default
+        return self.region_sum(name, row0, row1, col0, col1) / ((row1 - row0) * (col1 - col0))
+
+    def moisture_damping(self):
+        """exp(-moisture / MOISTURE_DECAY) for every cell, cached until the next write."""
+        if self._damping_version != self.version:
+            self._damping = np.exp(-self.moisture / MOISTURE_DECAY)
+            self._damping_version = self.version
+        return self._damping
+
+    def temperature_at_cells(self, rows, cols, diurnal):
+        """
+        Soil temperature of the given (in-bounds) cells, evaluated on demand.
+        diurnal is the cosine of the current diurnal phase (see soil.diurnal_cycle).
+        """
+        damping = self.moisture_damping()[rows, cols]
+        return self.base_temperature[rows, cols] + self.depth_factor[rows] * damping * np.float32(diurnal)
+
+    def mark_dirty(self, row0=0, row1=None, col0=0, col1=None):
+        """Record a write to a half-open window (the whole field by default)."""
+        row1 = self.rows if row1 is None else row1
+        col1 = self.cols if col1 is None else col1
+        row0, row1, col0, col1 = self.clip_region(row0, row1, col0, col1)
+        if row0 >= row1 or col0 >= col1:
+            return
+        self.tile_versions[row0 // TILE_SIZE:(row1 - 1) // TILE_SIZE + 1,
+                           col0 // TILE_SIZE:(col1 - 1) // TILE_SIZE + 1] += 1
+        self.version += 1
+
+    def mark_cells_dirty(self, rows, cols):
+        """Record writes to scattered cells given as parallel row/col index arrays."""
+        if len(rows) == 0:
+            return
+        self.tile_versions[np.asarray(rows) // TILE_SIZE, np.asarray(cols) // TILE_SIZE] += 1
+        self.version += 1
+
+    def tile_bounds(self, tile_row, tile_col):
+        """Return the (row0, row1, col0, col1) window covered by a tile."""
+        row0 = tile_row * TILE_SIZE
+        col0 = tile_col * TILE_SIZE
+        return row0, min(row0 + TILE_SIZE, self.rows), col0, min(col0 + TILE_SIZE, self.cols)
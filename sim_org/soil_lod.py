@@ -0,0 +1,157 @@
+# soil_lod.py
+
+import numpy as np
+import config
+import weather
+from config import CELL_SIZE
+from soil_field import TILE_SIZE
+from hydrology import moisture_solver
+
+QUIET_INTERVAL = 8   # quiet tiles step once every this many ticks, with dt scaled to match
+ACTIVE_HOLD = 20     # ticks a tile stays active after a write or a promotion
+ERROR_BUDGET = 0.05  # moisture drift a quiet cell may build up between its updates
+ACTIVE_HALO = 1      # tiles around root zones and seeds that also count as active
+
+
+def _runs(mask):
+    """(start, end) of every run of True in a 1-D bool array, end exclusive."""
+    edges = np.flatnonzero(np.diff(np.concatenate(([0], mask.astype(np.int8), [0]))))
+    return list(zip(edges[::2].tolist(), edges[1::2].tolist()))
+
+
+class SoilScheduler:
+    """
+    Multi-rate scheduling of the soil physics by tile.
+    Tiles near a root zone, an unsprouted seed or a recent write (water, rain,
+    uptake) are active and step every tick. Quiet tiles step once every
+    quiet_interval ticks with a dt that much larger. A quiet cell whose change
+    rate would move it by more than error_budget over one quiet interval has
+    its tile promoted to active.
+
+    Soil temperature needs no scheduling: it is evaluated on demand
+    (SoilField.temperature_at_cells), and uptake only ever touches root cells.
+    """
+    def __init__(self, quiet_interval=QUIET_INTERVAL, error_budget=ERROR_BUDGET):
+        self.quiet_interval = quiet_interval
+        self.error_budget = error_budget
+        self.tick = 0
+        self.active_tiles = None
+        self.cells_stepped = 0
+        self.cells_skipped = 0
+        self.promotions = 0
+        self._field = None
+        self._seen_versions = None
+        self._last_touched = None
+        self._cells = (None, None)  # (tiles, cells) of the last expansion
+
+    def _watch(self, field):
+        """Stamp tiles written outside the scheduler since the last tick."""
+        if field is not self._field:
+            self._field = field
+            self._seen_versions = field.tile_versions.copy()
+            self._last_touched = np.full(field.tile_versions.shape, self.tick, dtype=np.int64)
+            return
+        self._last_touched[field.tile_versions != self._seen_versions] = self.tick
+
+    def _mark_cells(self, tiles, row0, row1, col0, col1):
+        """Mark the tiles under a half-open cell window, plus the halo, as active."""
+        row0, row1, col0, col1 = self._field.clip_region(row0, row1, col0, col1)
+        if row0 >= row1 or col0 >= col1:
+            return
+        tiles[max(0, row0 // TILE_SIZE - ACTIVE_HALO):(row1 - 1) // TILE_SIZE + 1 + ACTIVE_HALO,
+              max(0, col0 // TILE_SIZE - ACTIVE_HALO):(col1 - 1) // TILE_SIZE + 1 + ACTIVE_HALO] = True
+
+    def activity(self, plants, seeds):
+        """Bool tile mask of what has to run at the full rate this tick."""
+        tiles = (self.tick - self._last_touched) < ACTIVE_HOLD
+        for plant in plants:
+            self._mark_cells(tiles, *plant.roots.root_zone())
+        for seed in seeds:
+            row, col = int(seed.y // CELL_SIZE), int(seed.x // CELL_SIZE)
+            self._mark_cells(tiles, row, row + 1, col, col + 1)
+        return tiles
+
+    def active_cells(self, tiles):
+        """Expand a tile mask to a full-field cell mask, reusing it while the tiles stay the same."""
+        cached_tiles, cells = self._cells
+        if cached_tiles is not None and np.array_equal(cached_tiles, tiles):
+            return cells
+        field = self._field
+        cells = np.repeat(np.repeat(tiles, TILE_SIZE, axis=0), TILE_SIZE, axis=1)[:field.rows, :field.cols]
+        self._cells = (tiles, cells)
+        return cells
+
+    def windows(self, tiles):
+        """
+        Cover the active tiles with non-overlapping cell windows: each band of
+        consecutive active tile rows is split into runs of consecutive columns
+        holding an active tile, and every window gets a one-cell halo so the
+        faces around its edge are stepped too.
+        """
+        field = self._field
+        windows = []
+        for tile_row0, tile_row1 in _runs(tiles.any(axis=1)):
+            for tile_col0, tile_col1 in _runs(tiles[tile_row0:tile_row1].any(axis=0)):
+                windows.append(field.clip_region(tile_row0 * TILE_SIZE - 1, tile_row1 * TILE_SIZE + 1,
+                                                 tile_col0 * TILE_SIZE - 1, tile_col1 * TILE_SIZE + 1))
+        return windows
+
+    def step(self, soil_properties, plants, seeds):
+        """
+        Run one tick of the soil processes for the given growing plants and
+        unsprouted seeds.
+        """
+        field = soil_properties['grid']
+        self._watch(field)
+        self.active_tiles = self.activity(plants, seeds)
+        cells = self.active_cells(self.active_tiles)
+
+        dt = config.TIME_SCALE / weather.sun.day_length
+        if self.active_tiles.all():
+            moisture_solver.step(soil_properties, dt)
+            rate_scale = 1.0
+        elif self.tick % self.quiet_interval == 0:
+            moisture_solver.step(soil_properties, dt, cells, self.quiet_interval)
+            rate_scale = 1.0 / self.quiet_interval
+        else:
+            moisture_solver.step(soil_properties, dt, cells, 0, self.windows(self.active_tiles))
+            rate_scale = 1.0
+        self.cells_stepped += moisture_solver.cells_stepped
+        self.cells_skipped += max(0, moisture_solver.cells_in_region - moisture_solver.cells_stepped)
+
+        for window, change in moisture_solver.changes:
+            self._promote(cells, window, change, rate_scale)
+
+        self._seen_versions[:] = field.tile_versions
+        self.tick += 1
+
+    def _promote(self, cells, window, change, rate_scale):
+        """
+        Make quiet tiles active where the change rate per tick (change * rate_scale)
+        would drift more than the error budget over one quiet interval.
+        """
+        row0, row1, col0, col1 = window
+        limit = self.error_budget / (self.quiet_interval * rate_scale)
+        over = (np.abs(change) > limit) & ~cells[row0:row1, col0:col1]
+        if not over.any():
+            return
+        rows, cols = np.nonzero(over)
+        tiles = np.unique(((rows + row0) // TILE_SIZE) * self._last_touched.shape[1]
+                          + (cols + col0) // TILE_SIZE)
+        self._last_touched.reshape(-1)[tiles] = self.tick
+        self.promotions += len(tiles)
+
+    def stats(self):
+        """Work counters, for profiling the soil step."""
+        total = self.cells_stepped + self.cells_skipped
+        return {
+            'tick': self.tick,
+            'active_tiles': int(self.active_tiles.sum()) if self.active_tiles is not None else 0,
+            'cells_stepped': self.cells_stepped,
+            'cells_skipped': self.cells_skipped,
+            'skipped_ratio': self.cells_skipped / total if total else 0.0,
+            'promotions': self.promotions,
+        }
+
+
+soil_scheduler = SoilScheduler()
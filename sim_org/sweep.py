@@ -0,0 +1,267 @@
+# sweep.py
+"""
+Parameter sweeps: expand a grid of soil types, seasons, pH and temperatures
+into independent headless runs (see run_scenario.py) and collect every
+plant's final stats into one CSV table.
+
+A sweep spec is a JSON object:
+
+    {
+        "scenario": {"seeds": [{"x": 300, "y": 300}], "days": 21},
+        "grid": {
+            "soil_type": ["sandy", "clay", "loam"],
+            "season": ["spring", "summer"],
+            "ph": [5.5, 6.5, 7.5],
+            "temperature": [15, 25]
+        },
+        "repeats": 1
+    }
+
+Every combination of the grid values is laid over the base scenario. Runs
+on one machine go through a process pool:
+
+    python sweep.py run spec.json -o results.csv
+
+To shard a sweep across machines that share a directory, enqueue it once,
+start workers wherever there are free cores, then collect the table:
+
+    python sweep.py enqueue spec.json queue/
+    python sweep.py work queue/
+    python sweep.py collect queue/ -o results.csv
+
+A worker claims a job by renaming its file from pending/ into claimed/, which
+is atomic on a shared filesystem, so no two workers run the same job. Jobs
+left in claimed/ by a worker that died can be moved back to pending/ by hand.
+"""
+
+import argparse
+import contextlib
+import copy
+import csv
+import glob
+import itertools
+import json
+import os
+import random
+import socket
+import sys
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+os.environ.setdefault("PYGAME_HIDE_SUPPORT_PROMPT", "1")
+
+import config
+import soil
+import weather
+from occupancy import root_occupancy
+from Plants.germination import germination_scheduler
+from soil_lod import soil_scheduler
+from hydrology import moisture_solver
+from run_scenario import load_scenario, run_scenario
+
+# Columns that come first in the results table, in this order.
+RUN_COLUMNS = ['run', 'repeat', 'seed', 'plant']
+
+# Module state a scenario changes, as it was at import time. A worker
+# process runs many jobs one after another, so each job starts from these.
+_DEFAULTS = {
+    'seasons': copy.deepcopy(weather.SEASONS),
+    'season': weather.current_season,
+    'soil_type': soil.soil_properties['type'],
+    'ph': soil.SOILPH,
+    'time_scale': config.TIME_SCALE,
+}
+
+
+def expand_grid(spec):
+    """One job per combination of grid values (and repeat), in grid order."""
+    base = spec.get('scenario', {})
+    grid = spec.get('grid', {})
+    names = list(grid)
+    jobs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        for repeat in range(spec.get('repeats', 1)):
+            scenario = dict(base, **dict(zip(names, values)))
+            jobs.append({
+                'run': len(jobs),
+                'repeat': repeat,
+                'seed': spec.get('seed', 0) + len(jobs),
+                'params': dict(zip(names, values)),
+                'scenario': scenario,
+            })
+    return jobs
+
+
+def reset_globals():
+    """Put the module-level simulation state back to how it was at import time."""
+    for name, season in _DEFAULTS['seasons'].items():
+        weather.SEASONS[name].update(season)
+    weather.set_season(_DEFAULTS['season'])
+    soil.set_soil_type(_DEFAULTS['soil_type'])
+    soil.SOILPH = _DEFAULTS['ph']
+    config.TIME_SCALE = _DEFAULTS['time_scale']
+    root_occupancy.clear()
+    # Rebuild the schedulers in place: other modules hold these objects by name,
+    # and their tick counters, heaps and active regions belong to the last job.
+    germination_scheduler.__init__()
+    soil_scheduler.__init__()
+    moisture_solver.__init__()
+
+
+def seed_generators(seed):
+    """Seed every random source a run draws from, so a job's rows depend only on the job."""
+    random.seed(seed)
+    soil.seed_rng(seed)
+    weather.rain_particles = weather.RainParticles(rng=np.random.default_rng(seed))
+
+
+def flatten_stats(stats):
+    """Flatten one plant's stats dict for a CSV row (uptake becomes uptake_<layer>)."""
+    row = {}
+    for key, value in stats.items():
+        if isinstance(value, dict):
+            for name, amount in value.items():
+                row[f'{key}_{name}'] = amount
+        else:
+            row[key] = value
+    return row
+
+
+def run_job(job):
+    """Run one sweep job in a clean environment and return its table rows."""
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        seed_generators(job['seed'])
+        reset_globals()
+        stats = run_scenario(job['scenario'])
+    rows = []
+    for index, plant_stats in enumerate(stats):
+        row = {'run': job['run'], 'repeat': job['repeat'], 'seed': job['seed'], 'plant': index}
+        row.update(job['params'])
+        row.update(flatten_stats(plant_stats))
+        rows.append(row)
+    return rows
+
+
+def run_jobs(jobs, workers=None):
+    """Run jobs across a process pool, one process per core by default."""
+    rows = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for job_rows in pool.map(run_job, jobs):
+            rows.extend(job_rows)
+    return rows
+
+
+def write_table(rows, path):
+    columns = list(RUN_COLUMNS)
+    for row in rows:
+        columns.extend(key for key in row if key not in columns)
+    f = sys.stdout if path == '-' else open(path, 'w', newline='')
+    try:
+        writer = csv.DictWriter(f, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+    finally:
+        if f is not sys.stdout:
+            f.close()
+
+
+# --- File-based work queue -------------------------------------------------
+
+def enqueue(jobs, queue_dir):
+    for state in ('pending', 'claimed', 'done'):
+        os.makedirs(os.path.join(queue_dir, state), exist_ok=True)
+    for job in jobs:
+        path = os.path.join(queue_dir, 'pending', f"{job['run']:06d}.json")
+        with open(path + '.tmp', 'w') as f:
+            json.dump(job, f)
+        os.replace(path + '.tmp', path)
+
+
+def claim(queue_dir):
+    """Claim the next pending job, or return None when there are none left."""
+    owner = f'{socket.gethostname()}-{os.getpid()}'
+    for path in sorted(glob.glob(os.path.join(queue_dir, 'pending', '*.json'))):
+        name = os.path.basename(path)
+        claimed = os.path.join(queue_dir, 'claimed', f'{name}.{owner}')
+        try:
+            os.rename(path, claimed)
+        except FileNotFoundError:
+            continue  # another worker got there first
+        with open(claimed) as f:
+            return json.load(f), claimed
+    return None
+
+
+def _queue_worker(queue_dir):
+    done = 0
+    while True:
+        claimed = claim(queue_dir)
+        if claimed is None:
+            return done
+        job, claimed_path = claimed
+        rows = run_job(job)
+        path = os.path.join(queue_dir, 'done', f"{job['run']:06d}.json")
+        with open(path + '.tmp', 'w') as f:
+            json.dump(rows, f)
+        os.replace(path + '.tmp', path)
+        os.remove(claimed_path)
+        done += 1
+
+
+def work(queue_dir, workers=None):
+    """Drain the queue with one claiming worker per core; returns the jobs run."""
+    workers = workers or os.cpu_count()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return sum(pool.map(_queue_worker, [queue_dir] * workers))
+
+
+def collect(queue_dir):
+    """Rows of every finished job, in run order."""
+    rows = []
+    for path in sorted(glob.glob(os.path.join(queue_dir, 'done', '*.json'))):
+        with open(path) as f:
+            rows.extend(json.load(f))
+    pending = len(glob.glob(os.path.join(queue_dir, 'pending', '*.json')))
+    claimed = len(glob.glob(os.path.join(queue_dir, 'claimed', '*')))
+    if pending or claimed:
+        print(f"{pending} jobs pending and {claimed} in progress; the table is partial", file=sys.stderr)
+    return rows
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run a grid of plant simulator scenarios.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run a sweep on this machine")
+    run.add_argument('spec', help="sweep spec JSON file")
+    run.add_argument('--workers', '-j', type=int, help="worker processes (default: one per core)")
+    run.add_argument('--output', '-o', default='-', help="CSV file for the results, '-' for stdout")
+
+    enqueue_cmd = commands.add_parser('enqueue', help="write a sweep's jobs into a queue directory")
+    enqueue_cmd.add_argument('spec')
+    enqueue_cmd.add_argument('queue')
+
+    work_cmd = commands.add_parser('work', help="run queued jobs until the queue is empty")
+    work_cmd.add_argument('queue')
+    work_cmd.add_argument('--workers', '-j', type=int)
+
+    collect_cmd = commands.add_parser('collect', help="gather finished jobs into one CSV")
+    collect_cmd.add_argument('queue')
+    collect_cmd.add_argument('--output', '-o', default='-')
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        jobs = expand_grid(load_scenario(args.spec))
+        write_table(run_jobs(jobs, args.workers), args.output)
+    elif args.command == 'enqueue':
+        jobs = expand_grid(load_scenario(args.spec))
+        enqueue(jobs, args.queue)
+        print(f"Queued {len(jobs)} jobs in {args.queue}", file=sys.stderr)
+    elif args.command == 'work':
+        print(f"Ran {work(args.queue, args.workers)} jobs", file=sys.stderr)
+    elif args.command == 'collect':
+        write_table(collect(args.queue), args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,42 @@
+# tests/test_germination.py
+import random
+import pytest
+import weather
+from simulation import Simulation
+from sweep import reset_globals
+from Plants.germination import germination_scheduler
+
+SEEDS = 1000
+TICKS = 30
+
+
+@pytest.fixture
+def dormant_field(monkeypatch):
+    # Cold enough that no seed germinates within the test.
+    reset_globals()
+    monkeypatch.setitem(weather.SEASONS[weather.current_season], 'temperature', 2.0)
+    rng = random.Random(0)
+    simulation = Simulation()
+    for _ in range(SEEDS):
+        simulation.add_seed(rng.randrange(10, 1190), 300)
+    while not all(seed.on_ground for seed in simulation.seeds):
+        simulation.settle_seeds()
+    simulation.start()
+    yield simulation
+    reset_globals()
+
+
+def test_dormant_seeds_stay_cheap(dormant_field):
+    # The first ticks predict every seed and let the initial moisture noise diffuse out.
+    dormant_field.step(TICKS)
+    predicted = germination_scheduler.repredictions
+    for _ in range(TICKS):
+        dormant_field.step(1)
+        # One live entry per seed, plus at most the slack compaction allows.
+        assert len(germination_scheduler._heap) <= 2 * SEEDS + 64
+
+    assert not any(seed.germinated for seed in dormant_field.seeds)
+    live = [entry for entry in germination_scheduler._heap if germination_scheduler._live(entry)]
+    assert len({id(entry[3]) for entry in live}) == len(live)
+    # Slow drift of the seeds' own cells must not re-predict every seed every tick.
+    assert germination_scheduler.repredictions - predicted < SEEDS * TICKS // 10
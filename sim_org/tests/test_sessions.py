@@ -0,0 +1,72 @@
+# tests/test_sessions.py
+import time
+import pytest
+import main
+import sessions
+from occupancy import root_occupancy
+from sessions import (DEFAULT_SESSION, SessionLimitError, SessionScheduler,
+                      create_session, get_session)
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """The session table as a server starts it, cleaned up even if a test fails."""
+    monkeypatch.setattr(sessions, 'SESSION_TIMEOUT', 0.5)
+    monkeypatch.setattr(sessions, 'MAX_SESSIONS', 4)
+    default = get_session(DEFAULT_SESSION)
+    yield default
+    for session in sessions.sessions.values():
+        session.viewers = 0
+    for session_id in list(sessions.sessions):
+        if session_id != DEFAULT_SESSION:
+            del sessions.sessions[session_id]
+
+
+def test_unviewed_session_expires(server):
+    scheduler = SessionScheduler(frame_budget=10)
+    stray = create_session()
+    watched = create_session()
+    watched.viewers = 1
+    for session in (server, stray, watched):
+        session.last_used = time.monotonic() - 1
+
+    # Stepping a session is not use: the stray one must still expire.
+    for _ in range(3):
+        scheduler.run_round()
+
+    assert stray.id not in sessions.sessions
+    assert watched.id in sessions.sessions
+    assert DEFAULT_SESSION in sessions.sessions
+
+
+def test_touched_session_is_kept(server):
+    scheduler = SessionScheduler(frame_budget=10)
+    session = create_session()
+    session.last_used = time.monotonic() - 1
+    session.touch()
+    scheduler.run_round()
+    assert session.id in sessions.sessions
+
+
+def test_sessions_are_capped_and_only_created_explicitly(server):
+    assert get_session('made-up') is None
+    created = [create_session() for _ in range(3)]
+    with pytest.raises(SessionLimitError):
+        create_session()
+
+    # Once one has gone idle, its slot can be reused.
+    created[0].last_used = time.monotonic() - 1
+    assert create_session().id in sessions.sessions
+    assert created[0].id not in sessions.sessions
+
+
+def test_deactivate_restores_outer_state(server):
+    outer = (main.simulation, dict(root_occupancy.__dict__))
+    session = create_session()
+    with session:
+        assert main.simulation is session.simulation
+        root_occupancy.claimed_in_session = True
+    assert main.simulation is outer[0]
+    assert root_occupancy.__dict__ == outer[1]
+    with session:
+        assert root_occupancy.claimed_in_session
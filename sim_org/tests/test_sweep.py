@@ -0,0 +1,21 @@
+# tests/test_sweep.py
+from sweep import expand_grid, run_job
+
+SPEC = {
+    "scenario": {"seeds": [{"x": 300, "y": 300}, {"x": 700, "y": 300}], "days": 15},
+    "grid": {"soil_type": ["loam", "sandy"], "ph": [6.5]},
+}
+
+
+def test_same_job_gives_same_rows():
+    first, second = expand_grid(SPEC)
+    rows = run_job(first)
+    run_job(second)  # a different job in between must not leak into the rerun
+    assert run_job(first) == rows
+
+
+def test_rows_carry_grid_values():
+    job = expand_grid(SPEC)[1]
+    rows = run_job(job)
+    assert len(rows) == 2
+    assert all(row['soil_type'] == 'sandy' and row['ph'] == 6.5 for row in rows)
@@ -0,0 +1,78 @@
+# uptake.py
+
+import numpy as np
+import config
+import weather
+from config import CELL_SIZE
+from soil_field import NUTRIENT_LAYERS
+
+UPTAKE_LAYERS = ('moisture',) + NUTRIENT_LAYERS
+
+# What one plant's roots draw from each cell they occupy, per simulated day.
+CELL_DEMAND = {
+    'moisture': 0.05,
+    'nitrogen': 0.02,
+    'phosphorus': 0.01,
+    'potassium': 0.01,
+}
+
+
+def gather_root_cells(plants, field):
+    """
+    Every grid cell the given plants' roots occupy, as parallel
+    (rows, cols, owner) arrays where owner indexes into plants. A cell appears
+    once per plant however many of its segments lie in it (a branch tip starts
+    on its parent's cell). Segments off the grid are dropped.
+    """
+    xs, ys, owners = [], [], []
+    for i, plant in enumerate(plants):
+        for tip in plant.roots.tips:
+            xs.append(tip.segments.column('x'))
+            ys.append(tip.segments.column('y'))
+            owners.append(np.full(len(tip.segments), i, dtype=np.intp))
+    if not xs:
+        empty = np.empty(0, dtype=np.intp)
+        return empty, empty, empty
+    rows = (np.concatenate(ys) // CELL_SIZE).astype(np.intp)
+    cols = (np.concatenate(xs) // CELL_SIZE).astype(np.intp)
+    owner = np.concatenate(owners)
+    on_grid = (rows >= 0) & (rows < field.rows) & (cols >= 0) & (cols < field.cols)
+    cells = field.rows * field.cols
+    keys = np.unique(owner[on_grid] * cells + rows[on_grid] * field.cols + cols[on_grid])
+    cell = keys % cells
+    return cell // field.cols, cell % field.cols, keys // cells
+
+
+def apply_root_uptake(plants, field):
+    """
+    Draw one tick of water and nutrients out of the soil field for all plants at once.
+    Each plant's demand is scattered into every cell its roots occupy; where a
+    cell holds less than the summed demand, every plant in it gets the same
+    fraction. The field is debited in one vectorized write per layer and each
+    plant is credited with what its roots obtained (see Plant.record_uptake).
+    """
+    per_tick = config.TIME_SCALE / weather.sun.day_length
+    if not plants or per_tick <= 0:
+        return  # a stopped clock draws nothing (and would divide by a zero demand)
+    rows, cols, owner = gather_root_cells(plants, field)
+    if len(rows) == 0:
+        return
+
+    cells, root_cell = np.unique(rows * field.cols + cols, return_inverse=True)
+    plants_per_cell = np.bincount(root_cell)
+
+    obtained = {}
+    for name in UPTAKE_LAYERS:
+        cell_demand = CELL_DEMAND[name] * per_tick
+        layer = field.layer(name).reshape(-1)
+        available = np.maximum(layer[cells], 0)
+        demand = plants_per_cell * cell_demand
+        taken = np.minimum(demand, available)
+        layer[cells] = available - taken
+        fraction = taken / demand
+        obtained[name] = np.bincount(owner, weights=fraction[root_cell] * cell_demand,
+                                     minlength=len(plants)).tolist()
+
+    field.mark_cells_dirty(cells // field.cols, cells % field.cols)
+    for i, plant in enumerate(plants):
+        plant.record_uptake({name: amounts[i] for name, amounts in obtained.items()})
@@ -1,9 +1,10 @@
 # weather.py
 
 import math
-import random
+from collections import OrderedDict
 import pygame
-from config import SCREEN_SIZE, TIME_SCALE, BLUE
+import numpy as np
+from config import SCREEN_SIZE, BLUE
 import config
 
 
@@ -86,41 +87,143 @@ class Moon:
     #     pygame.draw.circle(screen, (200, 200, 200), (int(moon_x), int(moon_y)), self.radius)
 
 
-def simulate_rain(soil_properties, rain_intensity):
-    for i, row in enumerate(soil_properties['grid']):
-        depth_factor = 1.0 if i < len(soil_properties['grid']) * 0.3 else 0.5
-        for cell in row:
-           
-            cell['moisture'] += (rain_intensity / 200) * (depth_factor/2) * soil_properties.get('moisture_retention', 1)
+# Per-row rain absorption, keyed by row count: full strength in the top 30% of rows, half below.
+_rain_depth_factors = {}
+
+def get_rain_depth_factor(rows):
+    depth_factor = _rain_depth_factors.get(rows)
+    if depth_factor is None:
+        depth_factor = np.where(np.arange(rows) < rows * 0.3, 1.0, 0.5).astype(np.float32)
+        _rain_depth_factors[rows] = depth_factor
+    return depth_factor
+
+def simulate_rain(soil_properties, rain_intensity, footprint=None):
+    """
+    Add one tick of rain to the soil field.
+    footprint limits the storm to part of the field: either a (start_col, end_col)
+    column range or a boolean mask over columns. None rains on every column.
+    """
+    field = soil_properties['grid']
+    rate = (rain_intensity / 200) / 2 * soil_properties.get('moisture_retention', 1)
+    increment = (get_rain_depth_factor(field.rows) * np.float32(rate))[:, None]
+
+    if footprint is None:
+        field.moisture += increment
+        field.mark_dirty()
+    elif isinstance(footprint, tuple):
+        col0, col1 = max(0, footprint[0]), min(field.cols, footprint[1])
+        if col0 >= col1:
+            return
+        field.moisture[:, col0:col1] += increment
+        field.mark_dirty(0, field.rows, col0, col1)
+    else:
+        cols = np.flatnonzero(footprint)
+        if len(cols) == 0:
+            return
+        field.moisture[:, cols] += increment
+        field.mark_dirty(0, field.rows, int(cols[0]), int(cols[-1]) + 1)
+
+RAIN_COLOUR = (173, 216, 230)
+MAX_RAIN_DROPS = 4000
+MAX_DROP_LENGTH = 15
+
+
+class RainParticles:
+    """
+    Fixed-capacity pool of rain drops stored as parallel arrays.
+    Dead slots are recycled by spawn(), so memory stays bounded at any intensity;
+    spawns that find no free slot are simply dropped.
+    """
+    def __init__(self, capacity=MAX_RAIN_DROPS, rng=None):
+        self.capacity = capacity
+        self.x = np.zeros(capacity, dtype=np.int32)
+        self.y = np.zeros(capacity, dtype=np.int32)
+        self.length = np.zeros(capacity, dtype=np.int32)
+        self.speed = np.zeros(capacity, dtype=np.int32)
+        self.alive = np.zeros(capacity, dtype=bool)
+        self._rng = np.random.default_rng() if rng is None else rng
+
+    def __len__(self):
+        return int(np.count_nonzero(self.alive))
+
+    def spawn(self, count):
+        free = np.flatnonzero(~self.alive)[:max(0, count)]
+        n = len(free)
+        if n == 0:
+            return
+        self.x[free] = self._rng.integers(0, SCREEN_SIZE[0], n, endpoint=True)
+        self.y[free] = self._rng.integers(-50, 0, n, endpoint=True)
+        self.length[free] = self._rng.integers(10, MAX_DROP_LENGTH, n, endpoint=True)
+        self.speed[free] = self._rng.integers(5, 10, n, endpoint=True)
+        self.alive[free] = True
+
+    def update(self):
+        self.y += self.speed * self.alive
+
+    def cull(self, height=SCREEN_SIZE[1]):
+        self.alive &= self.y < height
+
+    def draw(self, screen, color=RAIN_COLOUR):
+        """Draw every live drop as a 1px vertical streak in one surfarray write."""
+        live = np.flatnonzero(self.alive)
+        if len(live) == 0:
+            return
+        width, height = screen.get_size()
+        offsets = np.arange(MAX_DROP_LENGTH + 1)
+        ys = self.y[live, None] + offsets
+        xs = np.broadcast_to(self.x[live, None], ys.shape)
+        mask = (offsets <= self.length[live, None]) & (ys >= 0) & (ys < height) & (xs < width)
+        pixels = pygame.surfarray.pixels3d(screen)
+        pixels[xs[mask], ys[mask]] = color
+        del pixels
 
-rain_drops = [] 
+
+rain_particles = RainParticles()
 
 def update_and_draw_rain(screen, rain_intensity):
-    global rain_drops
-    
-    new_count = int(rain_intensity * 10)  
-    for _ in range(new_count):
-        drop = {
-            'x': random.randint(0, SCREEN_SIZE[0]),
-            'y': random.randint(-50, 0),
-            'length': random.randint(10, 15),
-            'speed': random.randint(5, 10)
-        }
-        rain_drops.append(drop)
-   
-    for drop in rain_drops:
-        drop['y'] += drop['speed']
-        pygame.draw.line(screen, (173, 216, 230), (drop['x'], drop['y']),
-                         (drop['x'], drop['y'] + drop['length']), 1)
-
-    rain_drops = [drop for drop in rain_drops if drop['y'] < SCREEN_SIZE[1]]
+    rain_particles.spawn(int(rain_intensity * 10))
+    rain_particles.update()
+    rain_particles.draw(screen)
+    rain_particles.cull()
+
+
+NIGHT_COLOUR = (0, 0, 139)      # dark blue for night
+DAY_COLOUR = (135, 206, 235)    # light blue for day
+ZENITH_SHADE = 0.7              # the top of the sky is this much darker than the horizon
+SKY_LEVELS = 64
+SKY_CACHE_SIZE = 16
 
+# Pre-rendered sky surfaces keyed by quantised light level, least recently used first.
+_sky_cache = OrderedDict()
+
+def render_sky(level):
+    """Render the sky for a quantised light level as a vertical zenith-to-horizon gradient."""
+    sky_height = SCREEN_SIZE[1] // 2
+    light_intensity = level / (SKY_LEVELS - 1)
+    night = np.array(NIGHT_COLOUR, dtype=np.float32)
+    day = np.array(DAY_COLOUR, dtype=np.float32)
+    horizon_color = night * (1 - light_intensity) + day * light_intensity
+    zenith_color = horizon_color * ZENITH_SHADE
+
+    blend_t = np.linspace(0.0, 1.0, sky_height, dtype=np.float32)[:, None]
+    column = (zenith_color * (1 - blend_t) + horizon_color * blend_t).astype(np.uint8)
+    surface = pygame.Surface((SCREEN_SIZE[0], sky_height))
+    pygame.surfarray.blit_array(surface, np.broadcast_to(column, (SCREEN_SIZE[0], sky_height, 3)))
+    return surface
+
+def get_sky_surface(level):
+    surface = _sky_cache.get(level)
+    if surface is None:
+        surface = _sky_cache[level] = render_sky(level)
+        if len(_sky_cache) > SKY_CACHE_SIZE:
+            _sky_cache.popitem(last=False)
+    else:
+        _sky_cache.move_to_end(level)
+    return surface
 
 def draw_sky(screen):
     season = SEASONS[current_season]
     day_length = season['day_length'] 
-    sky_height = SCREEN_SIZE[1] // 2
-
 
     current_time = pygame.time.get_ticks() / 1000.0
 
@@ -128,27 +231,8 @@ def draw_sky(screen):
 
     light_intensity = 0.5 * (1 + math.cos(2 * math.pi * (normalized_time - 0.5)))
 
-    night_color = (0, 0, 139)      # dark blue for night
-    day_color = (135, 206, 235)    # light blue for day
-
- 
-    sky_color = (
-        int(night_color[0] * (1 - light_intensity) + day_color[0] * light_intensity),
-        int(night_color[1] * (1 - light_intensity) + day_color[1] * light_intensity),
-        int(night_color[2] * (1 - light_intensity) + day_color[2] * light_intensity)
-    )
-
-
-    pygame.draw.rect(screen, sky_color, pygame.Rect(0, 0, SCREEN_SIZE[0], sky_height))
-
-    for i in range(sky_height):
-        blend_t = i / sky_height
-        blended_color = (
-            int(sky_color[0] * (1 - blend_t) + sky_color[0] * blend_t),
-            int(sky_color[1] * (1 - blend_t) + sky_color[1] * blend_t),
-            int(sky_color[2] * (1 - blend_t) + sky_color[2] * blend_t)
-        )
-        pygame.draw.line(screen, blended_color, (0, sky_height - i), (SCREEN_SIZE[0], sky_height - i))
+    level = int(round(light_intensity * (SKY_LEVELS - 1)))
+    screen.blit(get_sky_surface(level), (0, 0))
 
 def set_time_of_day(time_value, sun, moon):
     angle = (time_value / 100) * 2 * math.pi